@@ -1,11 +1,14 @@
 """Services module for FileUzi."""
 
 from .email_parser import (
+    extract_bodies,
     extract_email_body,
     extract_email_html_body,
     parse_body_with_signoff,
+    eml_has_attachments_fast,
     parse_eml_file,
     is_my_email,
+    is_my_email_lower,
     detect_email_direction,
     extract_embedded_images,
     extract_business_from_domain,
@@ -13,6 +16,7 @@ from .email_parser import (
 )
 
 from .job_detector import (
+    ProjectList,
     scan_projects_folder,
     parse_folder_name,
     extract_job_number_from_filename,
@@ -22,6 +26,10 @@ from .job_detector import (
 )
 
 from .filing_rules import (
+    ProjectMapping,
+    FilingRules,
+    build_keyword_automaton,
+    build_rules_matcher,
     get_filing_rules_path,
     get_project_mapping_path,
     load_project_mapping,
@@ -83,16 +91,20 @@ from .email_composer import (
 
 __all__ = [
     # Email parser
+    'extract_bodies',
     'extract_email_body',
     'extract_email_html_body',
     'parse_body_with_signoff',
+    'eml_has_attachments_fast',
     'parse_eml_file',
     'is_my_email',
+    'is_my_email_lower',
     'detect_email_direction',
     'extract_embedded_images',
     'extract_business_from_domain',
     'get_sender_name_and_business',
     # Job detector
+    'ProjectList',
     'scan_projects_folder',
     'parse_folder_name',
     'extract_job_number_from_filename',
@@ -100,6 +112,10 @@ __all__ = [
     'is_embedded_image',
     'detect_project_from_subject',
     # Filing rules
+    'ProjectMapping',
+    'FilingRules',
+    'build_keyword_automaton',
+    'build_rules_matcher',
     'get_filing_rules_path',
     'get_project_mapping_path',
     'load_project_mapping',
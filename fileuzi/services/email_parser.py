@@ -3,72 +3,103 @@ Email parsing functions for FileUzi.
 """
 
 import re
+import mmap
 import email
+from functools import lru_cache
 from email import policy
 from email.utils import parsedate_to_datetime, parseaddr
 from datetime import datetime
 
 from fileuzi.config import MY_EMAIL_ADDRESSES, SIGN_OFF_PATTERNS, DOMAIN_SUFFIXES
-from fileuzi.utils import HTMLTextExtractor
+from fileuzi.utils import html_to_text
+
+# Raw header scans used to skip MIME walks that cannot find anything
+# Attachment or inline disposition, allowing the value on a folded continuation line
+_ATTACHMENT_HEADER_RE = re.compile(
+    rb'^content-disposition:[ \t]*(?:\r?\n[ \t]+)*(attachment|inline)\b', re.IGNORECASE | re.MULTILINE
+)
+# Within one part's headers: a filename (Content-Disposition filename= or the
+# Content-Type name= fallback, including RFC 2231 forms), an image type, a Content-ID
+_PART_FILENAME_RE = re.compile(rb'[;\s](?:file)?name(?:\*\d+)?\*?[ \t]*=', re.IGNORECASE)
+_PART_IMAGE_TYPE_RE = re.compile(rb'^content-type:[ \t]*(?:\r?\n[ \t]+)*image/', re.IGNORECASE | re.MULTILINE)
+_PART_CONTENT_ID_RE = re.compile(rb'^content-id:[ \t]*(?:\r?\n[ \t]+)*[^\s]', re.IGNORECASE | re.MULTILINE)
+
+# All sign-off prefixes as one tuple so each line is checked with a single startswith()
+_SIGN_OFF_PREFIXES = tuple(p.lower() for p in SIGN_OFF_PATTERNS)
+
+
+def _decode_part(part):
+    """Decode a MIME part's payload to str, or None if empty or undecodable."""
+    payload = part.get_payload(decode=True)
+    if not payload:
+        return None
+    charset = part.get_content_charset() or 'utf-8'
+    try:
+        return payload.decode(charset, errors='replace')
+    except LookupError:
+        # Unknown charset name
+        return None
 
 
-def extract_email_body(msg):
+def extract_bodies(msg):
     """
-    Extract the text body from an email message.
+    Extract both the text body and the HTML body from an email in one walk.
 
-    Handles multipart emails - prefers text/plain, falls back to stripped text/html.
+    Each body part is transfer-decoded and charset-decoded at most once, so
+    callers that need both (e.g. PDF rendering) avoid decoding the HTML twice.
 
     Returns:
-        str: The email body text
+        tuple: (text_body, html_body) - text_body is a stripped str (prefers
+               text/plain, falls back to stripped text/html); html_body is the
+               raw HTML with cid: references intact, or None
     """
-    body = ''
+    plain = None
+    html = None
 
     if msg.is_multipart():
         for part in msg.walk():
-            content_type = part.get_content_type()
-            content_disposition = part.get_content_disposition()
-
             # Skip attachments
-            if content_disposition == 'attachment':
+            if part.get_content_disposition() == 'attachment':
                 continue
 
-            if content_type == 'text/plain':
-                payload = part.get_payload(decode=True)
-                if payload:
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        body = payload.decode(charset, errors='replace')
-                        break  # Prefer plain text
-                    except:
-                        pass
-            elif content_type == 'text/html' and not body:
-                payload = part.get_payload(decode=True)
-                if payload:
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        html_content = payload.decode(charset, errors='replace')
-                        extractor = HTMLTextExtractor()
-                        extractor.feed(html_content)
-                        body = extractor.get_text()
-                    except:
-                        pass
+            content_type = part.get_content_type()
+            if content_type == 'text/plain' and plain is None:
+                plain = _decode_part(part)
+            elif content_type == 'text/html' and html is None:
+                html = _decode_part(part)
+
+            if plain is not None and html is not None:
+                break
     else:
-        content_type = msg.get_content_type()
-        payload = msg.get_payload(decode=True)
-        if payload:
-            charset = msg.get_content_charset() or 'utf-8'
-            try:
-                if content_type == 'text/html':
-                    html_content = payload.decode(charset, errors='replace')
-                    extractor = HTMLTextExtractor()
-                    extractor.feed(html_content)
-                    body = extractor.get_text()
-                else:
-                    body = payload.decode(charset, errors='replace')
-            except:
-                pass
-
-    return body.strip()
+        decoded = _decode_part(msg)
+        if msg.get_content_type() == 'text/html':
+            html = decoded
+        else:
+            plain = decoded
+
+    if plain is not None:
+        body = plain
+    elif html is not None:
+        try:
+            body = html_to_text(html)
+        except Exception:
+            body = ''
+    else:
+        body = ''
+
+    return (body.strip(), html)
+
+
+def extract_email_body(msg):
+    """
+    Extract the text body from an email message.
+
+    Handles multipart emails - prefers text/plain, falls back to stripped text/html.
+
+    Returns:
+        str: The email body text
+    """
+    return extract_bodies(msg)[0]
 
 
 def extract_email_html_body(msg):
@@ -80,35 +111,7 @@ def extract_email_html_body(msg):
     Returns:
         str or None: The HTML body content, or None if no HTML body found
     """
-    if msg.is_multipart():
-        for part in msg.walk():
-            content_type = part.get_content_type()
-            content_disposition = part.get_content_disposition()
-
-            # Skip attachments
-            if content_disposition == 'attachment':
-                continue
-
-            if content_type == 'text/html':
-                payload = part.get_payload(decode=True)
-                if payload:
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        return payload.decode(charset, errors='replace')
-                    except:
-                        pass
-    else:
-        content_type = msg.get_content_type()
-        if content_type == 'text/html':
-            payload = msg.get_payload(decode=True)
-            if payload:
-                charset = msg.get_content_charset() or 'utf-8'
-                try:
-                    return payload.decode(charset, errors='replace')
-                except:
-                    pass
-
-    return None
+    return extract_bodies(msg)[1]
 
 
 def parse_body_with_signoff(body_text):
@@ -125,18 +128,19 @@ def parse_body_with_signoff(body_text):
     body_lines = []
     sign_off_type = None
 
-    for i, line in enumerate(lines):
+    for line in lines:
         line_stripped = line.strip()
         line_lower = line_stripped.lower()
 
-        # Check for sign-off patterns
-        for pattern in SIGN_OFF_PATTERNS:
-            if line_lower.startswith(pattern) or line_lower == pattern:
-                # Capture the actual text as it appeared in the email (case-preserving)
-                sign_off_type = line_stripped[:len(pattern)]
-                # Return everything before this line
-                body_clean = '\n'.join(body_lines).strip()
-                return (body_clean, sign_off_type)
+        # Check for sign-off patterns; only work out which one on a hit
+        if line_lower.startswith(_SIGN_OFF_PREFIXES):
+            for pattern in _SIGN_OFF_PREFIXES:
+                if line_lower.startswith(pattern):
+                    # Capture the actual text as it appeared in the email (case-preserving)
+                    sign_off_type = line_stripped[:len(pattern)]
+                    # Return everything before this line
+                    body_clean = '\n'.join(body_lines).strip()
+                    return (body_clean, sign_off_type)
 
         body_lines.append(line)
 
@@ -144,6 +148,60 @@ def parse_body_with_signoff(body_text):
     return (body_text.strip(), None)
 
 
+def _part_headers(raw, pos):
+    """
+    Return the header block of the MIME part whose header starts at pos.
+
+    The block runs back to the preceding blank line or boundary line and on
+    to the blank line that ends the headers.
+    """
+    start = max(raw.rfind(b'\n\n', 0, pos), raw.rfind(b'\n\r\n', 0, pos), raw.rfind(b'\n--', 0, pos))
+    end = min((i for i in (raw.find(b'\n\n', pos), raw.find(b'\n\r\n', pos)) if i != -1), default=len(raw))
+    # Keep the newline before the first header so ^ anchors and [;\s] match it
+    return raw[max(start, 0):end]
+
+
+def _has_attachment_headers(raw):
+    """True if raw (bytes or mmap) has a part header parse_eml_file would keep."""
+    for match in _ATTACHMENT_HEADER_RE.finditer(raw):
+        headers = _part_headers(raw, match.start())
+        if not _PART_FILENAME_RE.search(headers):
+            continue
+        if (match.group(1).lower() == b'inline'
+                and _PART_IMAGE_TYPE_RE.search(headers)
+                and _PART_CONTENT_ID_RE.search(headers)):
+            continue  # embedded image, handled by extract_embedded_images
+        return True
+    return False
+
+
+def eml_has_attachments_fast(eml_path):
+    """
+    Check whether an .eml file contains an attachment without parsing it.
+
+    Scans the raw bytes for part headers that parse_eml_file would count as an
+    attachment: an ``attachment`` or ``inline`` Content-Disposition (folded or
+    not) with a filename, skipping inline images with a Content-ID, which are
+    embedded in the body. Callers that only need a yes/no answer can skip
+    building the MIME tree.
+
+    This is a conservative pre-check: payloads are not decoded, so a named
+    part with an empty body still counts, but any part parse_eml_file would
+    return is reported. parse_eml_file runs the same scan to skip its
+    attachment walk.
+
+    Returns:
+        bool: True if an attachment header is present
+    """
+    with open(eml_path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _has_attachment_headers(mm)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return False
+
+
 def parse_eml_file(eml_path):
     """
     Parse an .eml file and extract metadata, body, and attachments.
@@ -158,13 +216,15 @@ def parse_eml_file(eml_path):
             'date_iso': str (ISO 8601),
             'message_id': str,
             'body': str (full body text),
+            'html_body': str or None (raw HTML body for PDF rendering),
             'body_clean': str (body above sign-off),
             'sign_off_type': str or None,
             'attachments': list of {'filename': str, 'data': bytes, 'size': int}
         }
     """
     with open(eml_path, 'rb') as f:
-        msg = email.message_from_binary_file(f, policy=policy.default)
+        raw = f.read()
+    msg = email.message_from_bytes(raw, policy=policy.default)
 
     # Extract headers
     from_addr = msg.get('From', '')
@@ -191,13 +251,16 @@ def parse_eml_file(eml_path):
     # Convert to ISO 8601
     date_iso = email_date.isoformat()
 
-    # Extract body
-    body = extract_email_body(msg)
+    # Extract body (text and HTML decoded together in a single walk)
+    body, html_body = extract_bodies(msg)
     body_clean, sign_off_type = parse_body_with_signoff(body)
 
     # Extract attachments (excluding embedded images which are handled separately)
+    # Skip the walk when the raw scan finds no part that could be kept
+    # (e.g. only inline signature images, or no Content-Disposition at all)
     attachments = []
-    for part in msg.walk():
+    parts = msg.walk() if _has_attachment_headers(raw) else ()
+    for part in parts:
         content_disposition = part.get_content_disposition()
         content_type = part.get_content_type()
         content_id = part.get('Content-ID', '')
@@ -232,36 +295,55 @@ def parse_eml_file(eml_path):
         'date_iso': date_iso,
         'message_id': message_id,
         'body': body,
+        'html_body': html_body,
         'body_clean': body_clean,
         'sign_off_type': sign_off_type,
         'attachments': attachments,
+        '_from_addr_lower': _lower_address(from_addr),  # Parsed once for direction checks
+        '_to_addr_lower': _lower_address(to_addr),
         '_raw_message': msg  # Raw email.message.Message for advanced processing
     }
 
 
-def is_my_email(email_str):
-    """Check if an email address matches one of our configured addresses."""
+def _lower_address(email_str):
+    """Parse an address header and return the bare address, lowercased."""
     _, addr = parseaddr(email_str)
-    addr_lower = addr.lower()
+    return addr.lower()
+
+
+def is_my_email_lower(addr_lower):
+    """Check an already-parsed, lowercased address against our configured addresses."""
     return any(my_addr.lower() in addr_lower for my_addr in MY_EMAIL_ADDRESSES)
 
 
+def is_my_email(email_str):
+    """Check if an email address matches one of our configured addresses."""
+    return is_my_email_lower(_lower_address(email_str))
+
+
 def detect_email_direction(email_data):
     """
     Detect if email is IN (import) or OUT (export) based on From/To.
 
+    Uses the lowercased addresses precomputed by parse_eml_file when present.
+
     Returns:
         str: 'IN' if email is to us, 'OUT' if email is from us
     """
-    from_addr = email_data.get('from', '')
-    to_addr = email_data.get('to', '')
+    from_lower = email_data.get('_from_addr_lower')
+    if from_lower is None:
+        from_lower = _lower_address(email_data.get('from', ''))
 
     # If FROM matches our email, it's outgoing (OUT/export)
-    if is_my_email(from_addr):
+    if is_my_email_lower(from_lower):
         return 'OUT'
 
+    to_lower = email_data.get('_to_addr_lower')
+    if to_lower is None:
+        to_lower = _lower_address(email_data.get('to', ''))
+
     # If TO matches our email, it's incoming (IN/import)
-    if is_my_email(to_addr):
+    if is_my_email_lower(to_lower):
         return 'IN'
 
     # Default to IN if we can't determine
@@ -311,22 +393,28 @@ def extract_embedded_images(msg, min_size=None):
     return embedded_images
 
 
-def extract_business_from_domain(email_addr):
-    """
-    Extract business name from email domain.
+# Generic/personal email domains that never identify a business
+_GENERIC_DOMAINS = frozenset([
+    'gmail', 'googlemail', 'yahoo', 'hotmail', 'outlook', 'icloud', 'aol',
+    'mail', 'email', 'live', 'msn', 'btinternet', 'sky', 'virginmedia',
+    'protonmail', 'zoho', 'ymail', 'rocketmail', 'fastmail', 'tutanota',
+    'gmx', 'web', 'me', 'mac', 'pm', 'proton'
+])
 
-    Examples:
-        john@smitharchitects.co.uk -> smitharchitects
-        info@acme-construction.com -> acme-construction
-    """
-    _, addr = parseaddr(email_addr)
-    if not addr or '@' not in addr:
+# Longest first so '.co.uk' is stripped before '.uk'
+_DOMAIN_SUFFIXES_BY_LENGTH = tuple(sorted(DOMAIN_SUFFIXES, key=len, reverse=True))
+
+
+@lru_cache(maxsize=4096)
+def _business_from_addr(addr_lower):
+    """Business name for a bare, lowercased address (memoised per address)."""
+    if not addr_lower or '@' not in addr_lower:
         return None
 
-    domain = addr.split('@')[1].lower()
+    domain = addr_lower.split('@')[1]
 
     # Remove common suffixes
-    for suffix in sorted(DOMAIN_SUFFIXES, key=len, reverse=True):
+    for suffix in _DOMAIN_SUFFIXES_BY_LENGTH:
         if domain.endswith(suffix):
             domain = domain[:-len(suffix)]
             break
@@ -335,18 +423,24 @@ def extract_business_from_domain(email_addr):
     business = domain.replace('.', '-').replace('_', '-')
 
     # Skip generic/personal email domains
-    generic_domains = [
-        'gmail', 'googlemail', 'yahoo', 'hotmail', 'outlook', 'icloud', 'aol',
-        'mail', 'email', 'live', 'msn', 'btinternet', 'sky', 'virginmedia',
-        'protonmail', 'zoho', 'ymail', 'rocketmail', 'fastmail', 'tutanota',
-        'gmx', 'web', 'mail', 'me', 'mac', 'pm', 'proton'
-    ]
-    if business in generic_domains:
+    if business in _GENERIC_DOMAINS:
         return None
 
     return business
 
 
+def extract_business_from_domain(email_addr):
+    """
+    Extract business name from email domain.
+
+    Examples:
+        john@smitharchitects.co.uk -> smitharchitects
+        info@acme-construction.com -> acme-construction
+    """
+    _, addr = parseaddr(email_addr)
+    return _business_from_addr(addr.lower())
+
+
 def get_sender_name_and_business(email_data, direction):
     """
     Extract sender name and business for folder naming.
@@ -373,7 +467,7 @@ def get_sender_name_and_business(email_data, direction):
         # Remove quotes if present
         name = name.strip('"\'')
 
-    # Extract business from domain
-    business = extract_business_from_domain(email_addr)
+    # Extract business from domain (address is already parsed)
+    business = _business_from_addr(email_addr.lower())
 
     return (name if name else None, business)
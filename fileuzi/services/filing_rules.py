@@ -4,27 +4,448 @@ Filing rules loading and matching for FileUzi.
 
 import re
 import csv
+import hashlib
+import importlib.util
+import sys
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from difflib import SequenceMatcher
 
 from fileuzi.config import FILING_RULES_FILENAME, PROJECT_MAPPING_FILENAME
 from fileuzi.utils import get_tools_folder_path
 
-# Import PDF extraction functions at module level for mockability
+# PDF extraction is only needed by the cascade's PDF steps, so pdf_generator
+# (and its PDF libraries) is imported on first use. These module-level
+# wrappers keep the functions patchable here.
+def extract_pdf_metadata_title(pdf_data):
+    try:
+        from .pdf_generator import extract_pdf_metadata_title as _extract
+    except ImportError:
+        # Graceful fallback if pdf_generator not available
+        return None
+    return _extract(pdf_data)
+
+
+def extract_pdf_first_content(pdf_data, char_limit=40):
+    try:
+        from .pdf_generator import extract_pdf_first_content as _extract
+    except ImportError:
+        return None
+    return _extract(pdf_data, char_limit)
+
+
+def is_valid_pdf_title(title, filename):
+    try:
+        from .pdf_generator import is_valid_pdf_title as _is_valid
+    except ImportError:
+        return False
+    return _is_valid(title, filename)
+
+
+# Optional C Aho-Corasick automaton for the exact keyword scan
 try:
-    from .pdf_generator import (
-        extract_pdf_metadata_title,
-        extract_pdf_first_content,
-        is_valid_pdf_title,
-    )
+    import ahocorasick
+    HAS_AHOCORASICK = True
 except ImportError:
-    # Graceful fallback if pdf_generator not available
-    def extract_pdf_metadata_title(pdf_data):
+    HAS_AHOCORASICK = False
+
+# Optional C++ string metrics (SIMD) for the fuzzy-match kernel
+try:
+    from rapidfuzz.distance import Indel
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Optional JIT for the fuzzy-match kernel (only pays off for very large rule sets).
+# numba and numpy take ~200ms to import and are only used when rapidfuzz is
+# missing, so they are imported, and the kernel compiled, on first use.
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+np = None
+_numba_kernel = None
+
+
+def _lcs_length(a, b):
+    """
+    Length of the longest common subsequence of a and b.
+
+    Bit-parallel (Hyyrö) formulation: one pass over b, with a held as a bit
+    vector. Python ints are unbounded so there is no 64-char limit.
+    """
+    masks = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count('1')
+
+
+def _fuzzy_ratio(a, b):
+    """Similarity in [0, 1]: 2 * LCS / (len(a) + len(b))."""
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return 2.0 * _lcs_length(a, b) / total
+
+
+def _best_fuzzy_ratio_py(keyword, words):
+    """Best _fuzzy_ratio of keyword against any of words."""
+    return max(_fuzzy_ratio(keyword, word) for word in words)
+
+
+def _best_fuzzy_ratio_kernel(kw, words_flat, word_offsets):
+    """_best_fuzzy_ratio_py over codepoint arrays (keyword <= 64 chars), for numba."""
+    m = kw.shape[0]
+    full = np.uint64(0xFFFFFFFFFFFFFFFF) if m == 64 else np.uint64((1 << m) - 1)
+
+    # Match masks built once per keyword: a table lookup for ASCII chars,
+    # so the per-char cost no longer scales with the keyword length
+    ascii_masks = np.zeros(128, dtype=np.uint64)
+    has_non_ascii = False
+    for i in range(m):
+        if kw[i] < 128:
+            ascii_masks[kw[i]] |= np.uint64(1) << np.uint64(i)
+        else:
+            has_non_ascii = True
+
+    best = 0.0
+    for w in range(word_offsets.shape[0] - 1):
+        start = word_offsets[w]
+        end = word_offsets[w + 1]
+        v = full
+        for j in range(start, end):
+            ch = words_flat[j]
+            if ch < 128:
+                mask = ascii_masks[ch]
+            else:
+                mask = np.uint64(0)
+                if has_non_ascii:
+                    for i in range(m):
+                        if kw[i] == ch:
+                            mask |= np.uint64(1) << np.uint64(i)
+            u = v & mask
+            v = ((v + u) | (v - u)) & full
+        zeros = 0
+        for i in range(m):
+            if (v >> np.uint64(i)) & np.uint64(1) == 0:
+                zeros += 1
+        ratio = 2.0 * zeros / (m + end - start)
+        if ratio > best:
+            best = ratio
+    return best
+
+
+def _load_numba_kernel():
+    """Import numba and compile the fuzzy kernel once; None if numba won't load."""
+    global np, _numba_kernel
+    if _numba_kernel is None:
+        try:
+            import numpy as np
+            from numba import njit
+        except ImportError:
+            return None
+        try:
+            _numba_kernel = njit(cache=True)(_best_fuzzy_ratio_kernel)
+        except RuntimeError:
+            # No writable cache location (read-only or frozen install)
+            _numba_kernel = njit(_best_fuzzy_ratio_kernel)
+    return _numba_kernel
+
+
+@lru_cache(maxsize=4096)
+def _encode_codepoints(text):
+    """Encode a string as a uint32 codepoint array (cached per keyword)."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _best_fuzzy_ratio_numba(keyword, words):
+    """Best fuzzy ratio of keyword against words, via the compiled kernel."""
+    kernel = _load_numba_kernel() if len(keyword) <= 64 else None
+    if kernel is None:
+        return _best_fuzzy_ratio_py(keyword, words)
+    words_flat = _encode_codepoints(''.join(words))
+    word_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(w) for w in words], out=word_offsets[1:])
+    return kernel(_encode_codepoints(keyword), words_flat, word_offsets)
+
+
+def _best_fuzzy_ratio_rapidfuzz(keyword, words):
+    """
+    Best fuzzy ratio of keyword against words, via rapidfuzz.
+
+    Indel distance is len(a) + len(b) - 2 * LCS, so the ratio is computed from
+    the integer distance and stays bit-identical to the other backends.
+    """
+    best = 0.0
+    for word in words:
+        total = len(keyword) + len(word)
+        ratio = (total - Indel.distance(keyword, word)) / total
+        if ratio > best:
+            best = ratio
+    return best
+
+
+# Fastest available backend; all compute the same 2 * LCS / (len(a) + len(b)) ratio
+if HAS_RAPIDFUZZ:
+    _best_fuzzy_ratio = _best_fuzzy_ratio_rapidfuzz
+elif HAS_NUMBA:
+    _best_fuzzy_ratio = _best_fuzzy_ratio_numba
+else:
+    _best_fuzzy_ratio = _best_fuzzy_ratio_py
+
+
+class ProjectMapping(dict):
+    """
+    Custom project number mapping (custom_project_no -> local_job_no).
+
+    Behaves exactly like a dict, but also keeps a single compiled alternation
+    regex over every custom project number so lookups are one regex scan
+    instead of one substring check per mapping. The pattern is rebuilt lazily
+    whenever the mapping is modified through any dict method.
+
+    When text contains several custom numbers, find() returns the one that
+    starts leftmost, and the longest of those starting at the same position
+    (so B-012 beats B-01). Mapping order does not matter.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled = None
+
+    def __setitem__(self, key, value):
+        self._compiled = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._compiled = None
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._compiled = None
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other):
+        self._compiled = None
+        return super().__ior__(other)
+
+    def setdefault(self, key, default=None):
+        self._compiled = None
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._compiled = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._compiled = None
+        return super().popitem()
+
+    def clear(self):
+        self._compiled = None
+        super().clear()
+
+    def _compile(self):
+        """Build the (pattern, prefix_pattern, lookup) triple, keyed on uppercased custom numbers."""
+        if self._compiled is None:
+            lookup = {}
+            for custom_no, local_no in self.items():
+                lookup.setdefault(custom_no.upper(), local_no)
+            pattern = None
+            prefix_pattern = None
+            if lookup:
+                # Longest first so overlapping references prefer the most specific;
+                # IGNORECASE means the searched text never has to be uppercased
+                alternation = '|'.join(re.escape(k) for k in sorted(lookup, key=len, reverse=True))
+                pattern = re.compile(alternation, re.IGNORECASE)
+                # Filename prefix: reference followed by underscore, space, or dash
+                prefix_pattern = re.compile(rf'^({alternation})[\s_\-]', re.IGNORECASE)
+            self._compiled = (pattern, prefix_pattern, lookup)
+        return self._compiled
+
+    def find(self, text):
+        """
+        Find a custom project number anywhere in text (case-insensitive).
+
+        Returns:
+            str or None: The mapped local job number, or None if no match
+        """
+        pattern, _, lookup = self._compile()
+        if pattern is None:
+            return None
+        match = pattern.search(text)
+        if match:
+            # Only the short matched reference is uppercased for the lookup
+            return lookup.get(match.group(0).upper())
         return None
-    def extract_pdf_first_content(pdf_data, char_limit=40):
+
+    def find_prefix(self, filename):
+        """
+        Find a custom project number used as a filename prefix (e.g. B-012_...).
+
+        Returns:
+            str or None: The mapped local job number, or None if no match
+        """
+        _, prefix_pattern, lookup = self._compile()
+        if prefix_pattern is None:
+            return None
+        match = prefix_pattern.match(filename)
+        if match:
+            return lookup.get(match.group(1).upper())
+        return None
+
+
+# Filename words: runs of word characters and hyphens
+_FILENAME_WORD_RE = re.compile(r'\b[\w\-]+\b')
+
+# str.translate table deleting the separators ignored by acronym matching
+_SEPARATOR_DELETE = str.maketrans('', '', '-_')
+
+# Maximum number of filenames remembered per FilingRules match cache
+MATCH_CACHE_SIZE = 4096
+
+
+class FilingRules(list):
+    """
+    List of filing rule dicts as returned by load_filing_rules.
+
+    Behaves exactly like a list, but also carries:
+        - keyword_automaton: an Aho-Corasick automaton over every rule's
+          keywords, so one linear scan of a filename finds all keywords it
+          contains (None when pyahocorasick is not installed)
+        - match_cache: LRU of match_filing_rules results keyed by
+          (filename, fuzzy_threshold, top_only), so repeated names in email
+          threads are not re-matched
+        - matcher: a match function generated for these rules by
+          build_rules_matcher (None falls back to the generic loop)
+
+    Treat it as read-only; reloading via load_filing_rules gives a fresh
+    automaton, matcher and an empty cache.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.keyword_automaton = None
+        self.matcher = None
+        self.match_cache = OrderedDict()
+
+
+def build_keyword_automaton(rules):
+    """
+    Build an Aho-Corasick automaton over all rules' lowercased keywords.
+
+    Returns:
+        ahocorasick.Automaton or None: Maps each keyword to itself, or None
+        if pyahocorasick is unavailable or there are no keywords
+    """
+    if not HAS_AHOCORASICK:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for rule in rules:
+        for spec in _get_keyword_specs(rule):
+            keyword_lower = spec[1]
+            automaton.add_word(keyword_lower, keyword_lower)
+
+    if len(automaton) == 0:
+        return None
+
+    automaton.make_automaton()
+    return automaton
+
+
+def build_rules_matcher(rules):
+    """
+    Generate a matcher specialised to one rule set (used by match_filing_rules).
+
+    The generic loop in _match_rules_on_tokens re-reads every rule's keyword
+    specs and re-decides each keyword's branches on every call. This emits
+    Python source with one straight-line block per keyword instead - keyword
+    literals, confidences and the applicable checks (phrase or single word,
+    acronym, fuzzy) are fixed at load time - and compiles it once. The result
+    must stay identical to the generic loop, which remains the fallback for
+    plain rule lists.
+
+    Returns:
+        function or None: matcher(name_without_ext, filename_words, cleaned_words,
+        fuzzy_words_by_len, keyword_hits, fuzzy_threshold, top_only), where
+        keyword_hits supports `keyword_lower in keyword_hits` (the automaton's
+        present keywords, or the name itself); None if no rule has keywords
+    """
+    namespace = {'_best_fuzzy_ratio': _best_fuzzy_ratio}
+    lines = [
+        'def _matcher(name, words, cleaned, fuzzy_by_len, hits, fuzzy_threshold, top_only):',
+        '    matches = []',
+    ]
+
+    def update(indent, confidence, k):
+        lines.append(f'{indent}if {confidence} > best:')
+        lines.append(f'{indent}    best = {confidence}')
+        lines.append(f'{indent}    keyword = _K{k}')
+
+    k = 0
+    for r, rule in enumerate(rules):
+        specs = _get_keyword_specs(rule)
+        if not specs:
+            continue
+        namespace[f'_R{r}'] = rule
+        lines.append(f'    # rule {r}')
+        lines.append('    best = 0')
+        lines.append('    keyword = None')
+
+        for keyword, keyword_lower, is_phrase, phrase_words, pattern, keyword_no_seps in specs:
+            namespace[f'_K{k}'] = keyword
+            namespace[f'_S{k}'] = pattern.search
+            # Later keywords cannot beat a perfect match
+            lines.append('    if best < 1.0:')
+            lines.append(f'        if {keyword_lower!r} in hits and _S{k}(name):')
+            if is_phrase:
+                update('            ', 1.0, k)
+                if phrase_words:
+                    all_words = ' and '.join(f'{w!r} in words' for w in phrase_words)
+                    lines.append(f'        elif {all_words}:')
+                    update('            ', 0.95, k)
+            else:
+                update('            ', 1.0 if len(keyword_lower) >= 4 else 0.9, k)
+            if len(keyword_no_seps) >= 3:
+                lines.append(f'        elif {keyword_no_seps!r} in words:')
+                update('            ', 0.95, k)
+            lines.append('        else:')
+            lines.append(f'            if {keyword_no_seps!r} in cleaned:')
+            update('                ', 0.95, k)
+            if len(keyword_lower) >= 5:
+                keyword_len = len(keyword_lower)
+                lengths = tuple(range(keyword_len - 3, keyword_len + 4))
+                lines.append('            if fuzzy_by_len:')
+                lines.append(f'                candidates = [w for n in {lengths!r} for w in fuzzy_by_len.get(n, ())]')
+                lines.append('                if candidates:')
+                lines.append(f'                    ratio = _best_fuzzy_ratio({keyword_lower!r}, candidates)')
+                lines.append('                    if ratio >= fuzzy_threshold and ratio > best:')
+                lines.append('                        best = ratio')
+                lines.append(f'                        keyword = _K{k}')
+            k += 1
+
+        lines.append('    if best > 0 and keyword:')
+        descriptor_tests = ' or '.join(
+            f'{d!r} in name or {d!r} in words' for d in (d.lower() for d in rule['descriptors'])
+        )
+        if descriptor_tests:
+            lines.append(f'        if best < 1.0 and ({descriptor_tests}):')
+            lines.append('            best = min(1.0, best + 0.05)')
+        lines.append(f"        match = {{'rule': _R{r}, 'confidence': best, 'matched_keyword': keyword}}")
+        lines.append('        if top_only and best >= 1.0:')
+        lines.append('            return [match]')
+        lines.append('        matches.append(match)')
+
+    if k == 0:
         return None
-    def is_valid_pdf_title(title, filename):
-        return False
+
+    lines.append("    matches.sort(key=lambda x: x['confidence'], reverse=True)")
+    lines.append('    return matches[:1] if top_only else matches')
+
+    exec(compile('\n'.join(lines), '<filing rules matcher>', 'exec'), namespace)
+    return namespace['_matcher']
 
 
 def get_filing_rules_path(projects_root):
@@ -37,6 +458,13 @@ def get_project_mapping_path(projects_root):
     return get_tools_folder_path(projects_root) / PROJECT_MAPPING_FILENAME
 
 
+def _csv_cell(row, index):
+    """Return a csv.reader row's cell by column index, '' if absent or short."""
+    if index is None or index >= len(row):
+        return ''
+    return row[index]
+
+
 def load_project_mapping(projects_root):
     """
     Load custom project number mapping from CSV file.
@@ -49,59 +477,60 @@ def load_project_mapping(projects_root):
     - Local/jwa/internal + job/project/number for local job numbers
 
     Returns:
-        dict: Mapping of custom_project_no -> local_job_no (e.g., {'B-012': '2505'})
+        ProjectMapping: Mapping of uppercased custom_project_no -> local_job_no
+                        (e.g., {'B-012': '2505'})
     """
     csv_path = get_project_mapping_path(projects_root)
 
     if not csv_path.exists():
-        return {}
+        return ProjectMapping()
 
-    mapping = {}
+    mapping = ProjectMapping()
     try:
         with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
 
             # Find the right columns by checking headers flexibly
             custom_col = None
             local_col = None
 
-            if reader.fieldnames:
-                for col in reader.fieldnames:
+            if fieldnames:
+                for i, col in enumerate(fieldnames):
                     col_lower = col.lower().replace(':', '').replace('_', ' ').strip()
 
                     # Look for custom/client/external project number column
                     if custom_col is None:
                         if any(kw in col_lower for kw in ['custom', 'client', 'external']):
-                            custom_col = col
+                            custom_col = i
                         elif col_lower in ['reference', 'ref', 'project no', 'project number']:
-                            custom_col = col
+                            custom_col = i
 
                     # Look for local/jwa/internal job number column
                     if local_col is None:
                         if any(kw in col_lower for kw in ['local', 'jwa', 'internal']):
-                            local_col = col
+                            local_col = i
                         elif col_lower in ['job no', 'job number', 'job']:
-                            local_col = col
+                            local_col = i
 
             # Fallback: if exactly 2 columns, assume first is custom, second is local
-            if (custom_col is None or local_col is None) and reader.fieldnames and len(reader.fieldnames) == 2:
-                custom_col = reader.fieldnames[0]
-                local_col = reader.fieldnames[1]
+            if (custom_col is None or local_col is None) and fieldnames and len(fieldnames) == 2:
+                custom_col = 0
+                local_col = 1
 
-            if not custom_col or not local_col:
-                print(f"Warning: Could not identify columns in project mapping CSV. Headers: {reader.fieldnames}")
-                return {}
+            if custom_col is None or local_col is None:
+                print(f"Warning: Could not identify columns in project mapping CSV. Headers: {fieldnames}")
+                return ProjectMapping()
 
             for row in reader:
-                custom_no = row.get(custom_col, '').strip()
-                local_no = row.get(local_col, '').strip()
+                custom_no = _csv_cell(row, custom_col).strip()
+                local_no = _csv_cell(row, local_col).strip()
                 if custom_no and local_no:
-                    # Store both original and uppercase for case-insensitive matching
-                    mapping[custom_no] = local_no
+                    # All lookups are case-insensitive, so keys are stored uppercase once
                     mapping[custom_no.upper()] = local_no
     except Exception as e:
         print(f"Warning: Failed to load project mapping: {e}")
-        return {}
+        return ProjectMapping()
 
     return mapping
 
@@ -110,6 +539,9 @@ def apply_project_mapping(text, mapping):
     """
     Check if text contains a custom project number and return the local job number.
 
+    If several custom numbers appear, the leftmost one wins (the longest, if
+    more than one starts there), regardless of their order in the mapping.
+
     Args:
         text: The text to check (filename or subject line)
         mapping: Dict of custom_project_no -> local_job_no
@@ -120,13 +552,11 @@ def apply_project_mapping(text, mapping):
     if not mapping:
         return None
 
-    # Check if text contains any custom project number (case-insensitive)
-    text_upper = text.upper()
-    for custom_no, local_no in mapping.items():
-        if custom_no.upper() in text_upper:
-            return local_no
+    # Plain dicts are wrapped so every caller gets the single-regex lookup
+    if not isinstance(mapping, ProjectMapping):
+        mapping = ProjectMapping(mapping)
 
-    return None
+    return mapping.find(text)
 
 
 def load_filing_rules(projects_root):
@@ -134,8 +564,9 @@ def load_filing_rules(projects_root):
     Load filing rules from CSV file in FILING-WIDGET-TOOLS folder.
 
     Returns:
-        list: List of rule dicts with keys: keywords, descriptors, folder_location,
-              folder_type, subfolder_structure, colour
+        FilingRules: List of rule dicts with keys: keywords, descriptors, folder_location,
+              folder_type, subfolder_structure, colour (plus the private
+              _keyword_specs, precompiled once here so matching never re-escapes)
         Returns None if CSV is missing (caller should handle error)
     """
     csv_path = get_filing_rules_path(projects_root)
@@ -143,43 +574,104 @@ def load_filing_rules(projects_root):
     if not csv_path.exists():
         return None
 
-    rules = []
+    rules = FilingRules()
     try:
         with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+
+            # Resolve columns once (headers are matched case-insensitively)
+            col = {h.strip().lower(): i for i, h in enumerate(header)}
+            pause_i = col.get('pause')
+            keywords_i = col.get('keywords')
+            descriptors_i = col.get('interchangeable_descriptors', col.get('descriptors'))
+            location_i = col.get('folder_location')
+            type_i = col.get('folder_type')
+            subfolder_i = col.get('subfolder_structure')
+            colour_i = col.get('colour')
+
             for row in reader:
+                if not row:
+                    continue
+
                 # Skip paused rules
-                pause_val = row.get('Pause', '') or row.get('pause', '')
-                if pause_val.strip().lower() == 'yes':
+                if _csv_cell(row, pause_i).strip().lower() == 'yes':
                     continue
 
-                # Parse keywords (support both | and , separators, case-insensitive headers)
-                keywords_raw = row.get('Keywords', '') or row.get('keywords', '')
-                # Split by both | and , to handle different formats
-                keywords_split = re.split(r'[|,]', keywords_raw)
-                keywords = [k.strip().lower() for k in keywords_split if k.strip()]
+                # Parse keywords (support both | and , separators)
+                keywords_split = re.split(r'[|,]', _csv_cell(row, keywords_i))
+                keywords = [sys.intern(k.strip().lower()) for k in keywords_split if k.strip()]
 
-                # Parse descriptors (support both | and , separators, case-insensitive headers)
-                descriptors_raw = row.get('Interchangeable_Descriptors', '') or row.get('descriptors', '')
-                descriptors_split = re.split(r'[|,]', descriptors_raw)
-                descriptors = [d.strip().lower() for d in descriptors_split if d.strip()]
+                # Parse descriptors (support both | and , separators)
+                descriptors_split = re.split(r'[|,]', _csv_cell(row, descriptors_i))
+                descriptors = [sys.intern(d.strip().lower()) for d in descriptors_split if d.strip()]
 
+                # Keyword, descriptor and folder strings repeat across rules; interning
+                # shares one object per value and lets equality checks short-circuit
+                # on identity
                 rules.append({
                     'keywords': keywords,
+                    '_keyword_specs': _compile_keyword_specs(keywords),  # Precompiled for matching
                     'descriptors': descriptors,
-                    'folder_location': (row.get('Folder_Location', '') or row.get('folder_location', '')).strip(),
-                    'folder_type': (row.get('Folder_Type', '') or row.get('folder_type', '')).strip(),
-                    'subfolder_structure': (row.get('Subfolder_Structure', '') or row.get('subfolder_structure', '')).strip(),
-                    'colour': (row.get('Colour', '') or row.get('colour', '') or '#64748b').strip(),
+                    'folder_location': sys.intern(_csv_cell(row, location_i).strip()),
+                    'folder_type': sys.intern(_csv_cell(row, type_i).strip()),
+                    'subfolder_structure': sys.intern(_csv_cell(row, subfolder_i).strip()),
+                    'colour': sys.intern((_csv_cell(row, colour_i) or '#64748b').strip()),
                 })
     except Exception as e:
         print(f"Error loading filing rules: {e}")
         return None
 
+    rules.keyword_automaton = build_keyword_automaton(rules)
+    rules.matcher = build_rules_matcher(rules)
     return rules
 
 
-def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
+def _compile_keyword(keyword):
+    """
+    Precompute the per-keyword matching data used by match_filing_rules.
+
+    Returns:
+        tuple or None: (keyword, keyword_lower, is_phrase, phrase_words, pattern,
+                        keyword_no_seps), or None if the keyword is too short to match
+    """
+    keyword_lower = sys.intern(keyword.lower().strip())
+
+    # Skip empty or too-short keywords (must be at least 2 chars)
+    if len(keyword_lower) < 2:
+        return None
+
+    keyword_words = keyword_lower.split()
+    is_phrase = len(keyword_words) > 1
+    phrase_words = tuple(w for w in keyword_words if len(w) >= 2)
+    pattern = re.compile(r'\b' + re.escape(keyword_lower) + r'\b')
+    keyword_no_seps = sys.intern(keyword_lower.replace(' ', '').replace('-', '').replace('_', ''))
+
+    return (keyword, keyword_lower, is_phrase, phrase_words, pattern, keyword_no_seps)
+
+
+def _compile_keyword_specs(keywords):
+    """
+    Precompute matching data for a list of keywords, dropping unusable ones.
+
+    Keywords that can score an exact 1.0 (phrases and single words of 4+ chars)
+    are ordered first, keeping their CSV order, so the keyword loop can stop
+    at a perfect match as early as possible.
+    """
+    specs = [spec for spec in map(_compile_keyword, keywords) if spec is not None]
+    specs.sort(key=lambda spec: 0 if spec[2] or len(spec[1]) >= 4 else 1)
+    return specs
+
+
+def _get_keyword_specs(rule):
+    """Keyword specs for a rule - precomputed by load_filing_rules, or built on the fly."""
+    specs = rule.get('_keyword_specs')
+    if specs is None:
+        specs = _compile_keyword_specs(rule['keywords'])
+    return specs
+
+
+def match_filing_rules(filename, rules, fuzzy_threshold=0.85, top_only=False):
     """
     Match a filename against filing rules.
 
@@ -191,18 +683,96 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
         - Descriptors alone do NOT trigger a match
         - Fuzzy matching only for words >= 5 chars and similarity >= 85%
 
+    Args:
+        top_only: Only the best match is needed - stop scanning rules as soon
+                  as one reaches confidence 1.0
+
     Returns:
         list: List of matching rules with confidence scores, sorted by confidence desc
               Each item is dict with: rule, confidence
+              (at most one item when top_only is set)
     """
     if not rules:
         return []
 
-    filename_lower = filename.lower()
+    # Repeat filenames are served from the rules' LRU cache (copies, so callers
+    # can't alter the cached results)
+    cache = getattr(rules, 'match_cache', None)
+    if cache is not None:
+        cache_key = (filename, fuzzy_threshold, top_only)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cache.move_to_end(cache_key)
+            return [dict(match) for match in cached]
+
+    matches = _match_rules_on_tokens(_tokenize_filename(filename), rules, fuzzy_threshold, top_only)
+
+    if cache is not None:
+        cache[cache_key] = [dict(match) for match in matches]
+        if len(cache) > MATCH_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    return matches
+
+
+@lru_cache(maxsize=256)
+def _tokenize_filename(text):
+    """
+    Split a filename (or PDF title/content line) into matching tokens.
+
+    Cached, so identical text - e.g. the same attachment name matched against
+    several rule sets - is only tokenized once. The returned containers are
+    shared between callers and must not be modified.
+
+    Returns:
+        tuple: (name_without_ext, filename_words, cleaned_words, fuzzy_words_by_len)
+    """
+    filename_lower = text.lower()
     # Remove extension for matching
     name_without_ext = filename_lower.rsplit('.', 1)[0] if '.' in filename_lower else filename_lower
     # Split into words for matching (only words 3+ chars)
-    filename_words = set(w for w in re.findall(r'\b[\w\-]+\b', name_without_ext) if len(w) >= 3)
+    filename_words = frozenset(w for w in _FILENAME_WORD_RE.findall(name_without_ext) if len(w) >= 3)
+    # Words with '-'/'_' removed (3+ chars), for separator-insensitive keyword hits
+    cleaned_words = frozenset(
+        cleaned for cleaned in (w.translate(_SEPARATOR_DELETE) for w in filename_words)
+        if len(cleaned) >= 3
+    )
+    # Bucket fuzzy-eligible words (5+ chars) by length so each keyword only
+    # scores words within 3 chars of its own length
+    fuzzy_words_by_len = {}
+    for word in filename_words:
+        if len(word) >= 5:
+            fuzzy_words_by_len.setdefault(len(word), []).append(word)
+
+    return (name_without_ext, filename_words, cleaned_words, fuzzy_words_by_len)
+
+
+def _match_rules_on_tokens(tokens, rules, fuzzy_threshold, top_only=False):
+    """
+    Score every rule against pre-tokenized text (see _tokenize_filename).
+
+    With top_only, the first rule to reach 1.0 is returned on its own, since
+    no later rule can outrank it.
+
+    Returns:
+        list: Matching rules as match_filing_rules describes, sorted by confidence desc
+    """
+    name_without_ext, filename_words, cleaned_words, fuzzy_words_by_len = tokens
+
+    # One automaton pass finds every keyword present as a substring; keywords
+    # absent from the filename cannot pass the word-boundary regex either
+    automaton = getattr(rules, 'keyword_automaton', None)
+    if automaton is not None:
+        present_keywords = {kw for _, kw in automaton.iter(name_without_ext)}
+    else:
+        present_keywords = None
+
+    # Rule sets from load_filing_rules carry a matcher generated for them
+    matcher = getattr(rules, 'matcher', None)
+    if matcher is not None:
+        keyword_hits = present_keywords if present_keywords is not None else name_without_ext
+        return matcher(name_without_ext, filename_words, cleaned_words, fuzzy_words_by_len,
+                       keyword_hits, fuzzy_threshold, top_only)
 
     matches = []
 
@@ -211,20 +781,23 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
         matched_keyword = None
 
         # Check each keyword
-        for keyword in rule['keywords']:
-            keyword_lower = keyword.lower().strip()
-
-            # Skip empty or too-short keywords (must be at least 2 chars)
-            if len(keyword_lower) < 2:
-                continue
-
-            keyword_words = keyword_lower.split()
+        for keyword, keyword_lower, is_phrase, phrase_words, pattern, keyword_no_seps in _get_keyword_specs(rule):
+            # Nothing can beat a perfect match, so stop scanning this rule
+            if best_confidence >= 1.0:
+                break
+
+            # Exact keyword hit (whole words). The regex only runs once the keyword
+            # is known to occur as a substring - via the automaton, or else a
+            # plain `in` test, which is far cheaper than a failing regex search
+            if present_keywords is not None:
+                substring_hit = keyword_lower in present_keywords
+            else:
+                substring_hit = keyword_lower in name_without_ext
+            exact_hit = substring_hit and pattern.search(name_without_ext)
 
             # Multi-word phrase: check if phrase appears with word boundaries
-            if len(keyword_words) > 1:
-                # Use regex to match phrase with word boundaries
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, name_without_ext):
+            if is_phrase:
+                if exact_hit:
                     confidence = 1.0
                     if confidence > best_confidence:
                         best_confidence = confidence
@@ -232,8 +805,7 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
                     continue
 
                 # Also try word-by-word match (words can be separated)
-                all_words_found = all(w in filename_words for w in keyword_words if len(w) >= 2)
-                if all_words_found and len([w for w in keyword_words if len(w) >= 2]) > 0:
+                if phrase_words and all(w in filename_words for w in phrase_words):
                     confidence = 0.95
                     if confidence > best_confidence:
                         best_confidence = confidence
@@ -241,10 +813,9 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
                     continue
 
             # Single word: must match as whole word, not substring
-            # Use regex word boundary to prevent "OS" matching inside "propOSed"
+            # Word boundaries prevent "OS" matching inside "propOSed"
             else:
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, name_without_ext):
+                if exact_hit:
                     confidence = 1.0 if len(keyword_lower) >= 4 else 0.9
                     if confidence > best_confidence:
                         best_confidence = confidence
@@ -252,7 +823,6 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
                     continue
 
             # Acronym match (for words like "BS5837" matching "bs 5837")
-            keyword_no_seps = keyword_lower.replace(' ', '').replace('-', '').replace('_', '')
             if len(keyword_no_seps) >= 3 and keyword_no_seps in filename_words:
                 confidence = 0.95
                 if confidence > best_confidence:
@@ -261,44 +831,75 @@ def match_filing_rules(filename, rules, fuzzy_threshold=0.85):
                 continue
 
             # Also check if filename word without common separators matches keyword
-            for word in filename_words:
-                word_cleaned = word.replace('-', '').replace('_', '')
-                if word_cleaned == keyword_no_seps and len(word_cleaned) >= 3:
-                    confidence = 0.95
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        matched_keyword = keyword
-                    break
+            if keyword_no_seps in cleaned_words:
+                confidence = 0.95
+                if confidence > best_confidence:
+                    best_confidence = confidence
+                    matched_keyword = keyword
 
             # Fuzzy match - only for keywords >= 5 chars
-            if len(keyword_lower) >= 5:
-                for word in filename_words:
-                    if len(word) >= 5 and abs(len(word) - len(keyword_lower)) <= 3:
-                        ratio = SequenceMatcher(None, keyword_lower, word).ratio()
-                        if ratio >= fuzzy_threshold:
-                            if ratio > best_confidence:
-                                best_confidence = ratio
-                                matched_keyword = keyword
+            if len(keyword_lower) >= 5 and fuzzy_words_by_len:
+                keyword_len = len(keyword_lower)
+                candidates = [
+                    word
+                    for length in range(keyword_len - 3, keyword_len + 4)
+                    for word in fuzzy_words_by_len.get(length, ())
+                ]
+                if candidates:
+                    ratio = _best_fuzzy_ratio(keyword_lower, candidates)
+                    if ratio >= fuzzy_threshold and ratio > best_confidence:
+                        best_confidence = ratio
+                        matched_keyword = keyword
 
         # If we found a keyword match, check for descriptor bonus
         if best_confidence > 0 and matched_keyword:
-            for descriptor in rule['descriptors']:
+            # The bonus is capped at 1.0, so skip the scan when already there
+            descriptors = rule['descriptors'] if best_confidence < 1.0 else ()
+            for descriptor in descriptors:
                 descriptor_lower = descriptor.lower()
                 if descriptor_lower in name_without_ext or descriptor_lower in filename_words:
                     best_confidence = min(1.0, best_confidence + 0.05)
                     break
 
-            matches.append({
+            match = {
                 'rule': rule,
                 'confidence': best_confidence,
                 'matched_keyword': matched_keyword
-            })
+            }
+
+            # Sorting is stable, so the first perfect rule would be ranked first
+            if top_only and best_confidence >= 1.0:
+                return [match]
+
+            matches.append(match)
 
     # Sort by confidence descending
     matches.sort(key=lambda x: x['confidence'], reverse=True)
+    if top_only:
+        return matches[:1]
     return matches
 
 
+# Extracted PDF text keyed by (extractor, content digest), so an attachment
+# that is matched again (e.g. on re-selection) is not re-parsed
+PDF_TEXT_CACHE_SIZE = 128
+_pdf_text_cache = OrderedDict()
+
+
+def _cached_pdf_text(extractor, pdf_data, digest):
+    """Run a PDF text extractor, reusing its result for identical attachment bytes."""
+    key = (extractor, digest)
+    if key in _pdf_text_cache:
+        _pdf_text_cache.move_to_end(key)
+        return _pdf_text_cache[key]
+
+    text = extractor(pdf_data)
+    _pdf_text_cache[key] = text
+    if len(_pdf_text_cache) > PDF_TEXT_CACHE_SIZE:
+        _pdf_text_cache.popitem(last=False)
+    return text
+
+
 def match_filing_rules_cascade(filename, rules, attachment_data=None, job_number=None, project_mapping=None):
     """
     Multi-step cascade matching for filing rules.
@@ -317,27 +918,30 @@ def match_filing_rules_cascade(filename, rules, attachment_data=None, job_number
     if filename_matches:
         return filename_matches
 
-    # Step 2: Try PDF metadata title (if this is a PDF with data)
-    if attachment_data and filename.lower().endswith('.pdf'):
-        try:
-            title = extract_pdf_metadata_title(attachment_data)
-            if title and is_valid_pdf_title(title, filename):
-                title_matches = match_filing_rules(title, rules)
-                if title_matches:
-                    return title_matches
-        except Exception:
-            pass
-
-    # Step 3: Try PDF first content line (if this is a PDF with data)
-    if attachment_data and filename.lower().endswith('.pdf'):
-        try:
-            first_content = extract_pdf_first_content(attachment_data)
-            if first_content:
-                content_matches = match_filing_rules(first_content, rules)
-                if content_matches:
-                    return content_matches
-        except Exception:
-            pass
+    if not (attachment_data and filename.lower().endswith('.pdf')):
+        return []
+
+    digest = hashlib.blake2b(attachment_data, digest_size=16).digest()
+
+    # Step 2: Try PDF metadata title
+    try:
+        title = _cached_pdf_text(extract_pdf_metadata_title, attachment_data, digest)
+        if title and is_valid_pdf_title(title, filename):
+            title_matches = match_filing_rules(title, rules)
+            if title_matches:
+                return title_matches
+    except Exception:
+        pass
+
+    # Step 3: Try PDF first content line
+    try:
+        first_content = _cached_pdf_text(extract_pdf_first_content, attachment_data, digest)
+        if first_content:
+            content_matches = match_filing_rules(first_content, rules)
+            if content_matches:
+                return content_matches
+    except Exception:
+        pass
 
     # Step 4: No matches found - return empty
     return []
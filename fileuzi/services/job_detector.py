@@ -2,9 +2,49 @@
 Job number detection functions for FileUzi.
 """
 
+import os
 import re
 from pathlib import Path
 
+from .filing_rules import ProjectMapping, apply_project_mapping
+
+# Project folder name formats: "2506 - SMITH EXTENSION" and "2506_SMITH-EXTENSION"
+_FOLDER_DASH_RE = re.compile(r'^(\d{4,5})\s*[-–]\s*(.+)$')
+_FOLDER_UNDERSCORE_RE = re.compile(r'^(\d{4,5})_(.+)$')
+
+# Filename job prefixes: "2506_..." and old format "2506 - ..."
+_JOB_PREFIX_RE = re.compile(r'^(\d{4,5})_')
+_JOB_DASH_PREFIX_RE = re.compile(r'^(\d{4,5})\s*[-–]\s*')
+
+# Embedded/inline image names (matched against the lowercased base name):
+# 'image' + digits, a long number, or a UUID/hash-like name
+_EMBEDDED_IMAGE_RE = re.compile(r'^(?:image\d+|\d{10,}|[a-f0-9\-]{20,})$')
+# Shortest name the pattern accepts ('image0')
+_EMBEDDED_IMAGE_MIN_LEN = 6
+
+# Email subject parsing
+_PREFIX_STRIP_RE = re.compile(r'^\s*(?:(?:RE|FW|Fwd):\s*)*', re.IGNORECASE)
+# A 4-5 digit number leading the subject (even if more digits follow), else
+# any standalone one; leftmost-first, so one scan yields them in priority order
+_SUBJECT_JOB_RE = re.compile(r'^\d{4,5}|\b\d{4,5}\b')
+
+# Parsed scan results per projects root: str(root) -> ((st_mtime_ns, st_nlink), projects)
+_scan_cache = {}
+
+
+class ProjectList(list):
+    """
+    List of (job_number, project_name) tuples as returned by scan_projects_folder.
+
+    Also carries job_numbers, a frozenset of the job numbers, so subject
+    detection can test membership in O(1) instead of rebuilding and scanning
+    a list on every call. Treat it as read-only.
+    """
+
+    def __init__(self, projects=()):
+        super().__init__(projects)
+        self.job_numbers = frozenset(p[0] for p in self)
+
 
 def scan_projects_folder(projects_root):
     """
@@ -14,27 +54,42 @@ def scan_projects_folder(projects_root):
     (4-5 digit job number followed by " - " and project name)
 
     Returns:
-        list: List of tuples (job_number, project_name) sorted by job number descending
+        ProjectList: List of tuples (job_number, project_name) sorted by job number descending
     """
     projects = []
     root_path = Path(projects_root)
 
-    if not root_path.exists():
-        return projects
-
-    for item in root_path.iterdir():
-        # Only process directories, ignore files
-        if not item.is_dir():
-            continue
-
-        # Use existing parse_folder_name function to extract job number and name
-        job_number, project_name = parse_folder_name(item.name)
-        if job_number and project_name:
-            projects.append((job_number, project_name))
+    try:
+        root_stat = root_path.stat()
+    except OSError:
+        return ProjectList()
+
+    # A directory's mtime changes when entries are added, removed or renamed;
+    # st_nlink also tracks subfolder count within one coarse mtime tick
+    cache_key = str(root_path)
+    signature = (root_stat.st_mtime_ns, root_stat.st_nlink)
+    cached = _scan_cache.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return ProjectList(cached[1])
+
+    # scandir entries carry the file type from the directory listing, so
+    # is_dir() needs no per-entry stat (except for symlinks, which it follows)
+    with os.scandir(root_path) as entries:
+        for entry in entries:
+            # Only process directories, ignore files
+            if not entry.is_dir():
+                continue
+
+            # Use existing parse_folder_name function to extract job number and name
+            job_number, project_name = parse_folder_name(entry.name)
+            if job_number and project_name:
+                projects.append((job_number, project_name))
 
     # Sort by job number descending (newest jobs first)
     projects.sort(key=lambda x: x[0], reverse=True)
 
+    projects = ProjectList(projects)
+    _scan_cache[cache_key] = (signature, tuple(projects))
     return projects
 
 
@@ -46,14 +101,14 @@ def parse_folder_name(folder_name):
         tuple: (job_number, project_name) or (None, None) if invalid
     """
     # Try dash format first: "2506 - SMITH EXTENSION"
-    match = re.match(r'^(\d{4,5})\s*[-–]\s*(.+)$', folder_name)
+    match = _FOLDER_DASH_RE.match(folder_name)
     if match:
         job_number = match.group(1)
         project_name = match.group(2).strip()
         return (job_number, project_name)
 
     # Try underscore format: "2506_SMITH-EXTENSION"
-    match = re.match(r'^(\d{4,5})_(.+)$', folder_name)
+    match = _FOLDER_UNDERSCORE_RE.match(folder_name)
     if match:
         job_number = match.group(1)
         project_name = match.group(2).strip()
@@ -75,22 +130,21 @@ def extract_job_number_from_filename(filename, project_mapping=None):
         str: job_number or None if not found
     """
     # Check custom project mappings FIRST (allows B-012 style prefixes)
+    # One combined alternation covers every mapped prefix
     if project_mapping:
-        for custom_no, local_no in project_mapping.items():
-            # Check for patterns like B-012_... or B-012 - ...
-            escaped = re.escape(custom_no)
-            # Match prefix followed by underscore, space, or dash
-            pattern = rf'^{escaped}[\s_\-]'
-            if re.match(pattern, filename, re.IGNORECASE):
-                return local_no
+        if not isinstance(project_mapping, ProjectMapping):
+            project_mapping = ProjectMapping(project_mapping)
+        local_no = project_mapping.find_prefix(filename)
+        if local_no is not None:
+            return local_no
 
     # Then check standard numeric pattern (underscore format)
-    match = re.match(r'^(\d{4,5})_', filename)
+    match = _JOB_PREFIX_RE.match(filename)
     if match:
         return match.group(1)
 
     # Check old format: "2506 - 04A - PROPOSED PLANS.pdf"
-    match = re.match(r'^(\d{4,5})\s*[-–]\s*', filename)
+    match = _JOB_DASH_PREFIX_RE.match(filename)
     if match:
         return match.group(1)
 
@@ -127,20 +181,13 @@ def is_embedded_image(filename):
     Check if filename looks like an embedded/inline image.
     These typically have names like 'image1769415576585.png' or 'image1769415576585'
     """
-    name_lower = filename.lower()
     # Remove extension if present
-    base_name = name_lower.rsplit('.', 1)[0] if '.' in name_lower else name_lower
+    base_name = filename.lower().rsplit('.', 1)[0]
 
-    # Pattern: 'image' followed by digits (with or without extension)
-    if re.match(r'^image\d+$', base_name):
-        return True
-    # Pattern: just a long number (with or without extension)
-    if re.match(r'^\d{10,}$', base_name):
-        return True
-    # Pattern: UUID-like or hash-like names
-    if re.match(r'^[a-f0-9\-]{20,}$', base_name):
-        return True
-    return False
+    # Typical document names are longer, but short ones never need the regex
+    if len(base_name) < _EMBEDDED_IMAGE_MIN_LEN:
+        return False
+    return _EMBEDDED_IMAGE_RE.match(base_name) is not None
 
 
 def detect_project_from_subject(subject, known_projects, project_mapping=None):
@@ -149,13 +196,15 @@ def detect_project_from_subject(subject, known_projects, project_mapping=None):
 
     Detection logic:
     1. Strip RE:/FW:/Fwd: prefixes
-    2. Check mapping CSV for client references (e.g., B-013 -> 2507)
-    3. Look for 4-digit job number
-    4. Check if it matches a known project
+    2. Check mapping CSV for client references (e.g., B-013 -> 2507); if the
+       subject holds several, the leftmost wins (longest at the same position),
+       not the first in mapping order
+    3. Look for a 4-5 digit job number that matches a known project,
+       preferring one at the start of the subject
 
     Args:
         subject: Email subject line
-        known_projects: List of (project_number, project_name) tuples
+        known_projects: List (or ProjectList) of (project_number, project_name) tuples
         project_mapping: Dict mapping client references to local job numbers
 
     Returns:
@@ -164,39 +213,30 @@ def detect_project_from_subject(subject, known_projects, project_mapping=None):
     if not subject:
         return None
 
-    # Normalize known_projects to a list of job number strings
+    # Normalize known_projects to a set of job number strings (a ProjectList
+    # from scan_projects_folder already carries one)
     # Handles both list of strings ['2506', '2407'] and list of tuples [('2506', 'name'), ...]
-    if known_projects and isinstance(known_projects[0], (list, tuple)):
-        known_job_numbers = [p[0] for p in known_projects]
-    else:
-        known_job_numbers = list(known_projects) if known_projects else []
+    known_job_numbers = getattr(known_projects, 'job_numbers', None)
+    if known_job_numbers is None:
+        if known_projects and isinstance(known_projects[0], (list, tuple)):
+            known_job_numbers = frozenset(p[0] for p in known_projects)
+        else:
+            known_job_numbers = frozenset(known_projects) if known_projects else frozenset()
 
     # Strip ALL RE:/FW:/Fwd: prefixes (handles multiple like "RE: RE: RE:")
-    cleaned = subject
-    while True:
-        new_cleaned = re.sub(r'^(RE|FW|Fwd):\s*', '', cleaned, count=1, flags=re.IGNORECASE).strip()
-        if new_cleaned == cleaned:
-            break
-        cleaned = new_cleaned
+    cleaned = _PREFIX_STRIP_RE.sub('', subject, count=1).strip()
 
     # Step 1: Check project mapping for client references anywhere in subject
+    # (one case-insensitive alternation scan over all custom numbers)
     if project_mapping:
-        for custom_no, local_no in project_mapping.items():
-            # Case-insensitive check if custom number appears in subject
-            if custom_no.upper() in cleaned.upper():
-                return local_no
-
-    # Step 2: Look for 4-5 digit job number at the start
-    match = re.match(r'^(\d{4,5})\s*[-–]?\s*', cleaned)
-    if match:
-        job_number = match.group(1)
-        if job_number in known_job_numbers:
-            return job_number
-
-    # Step 3: Look for 4-5 digit number anywhere in subject
-    all_numbers = re.findall(r'\b(\d{4,5})\b', cleaned)
-    for num in all_numbers:
-        if num in known_job_numbers:
-            return num
+        local_no = apply_project_mapping(cleaned, project_mapping)
+        if local_no is not None:
+            return local_no
+
+    # Step 2: Look for a known 4-5 digit job number, at the start first and
+    # then anywhere in the subject
+    for match in _SUBJECT_JOB_RE.finditer(cleaned):
+        if match.group() in known_job_numbers:
+            return match.group()
 
     return None
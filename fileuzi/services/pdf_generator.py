@@ -4,13 +4,24 @@ PDF generation and extraction functions for FileUzi.
 
 import os
 import re
-import base64
+import binascii
+import html as html_module
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 
 from fileuzi.utils import get_file_ops_logger, safe_write_attachment
 
+from .email_parser import (
+    extract_email_html_body,
+    extract_embedded_images,
+    is_my_email,
+    is_my_email_lower,
+)
+
 # Optional imports
 try:
     from PIL import Image
@@ -32,6 +43,13 @@ except ImportError:
 
 HAS_PDF_RENDERER = HAS_WEASYPRINT or HAS_XHTML2PDF
 
+# PyMuPDF is much faster than pypdf for the metadata/page-1 probes
+try:
+    import fitz
+    HAS_FITZ = True
+except ImportError:
+    HAS_FITZ = False
+
 try:
     from pypdf import PdfReader
     HAS_PYPDF = True
@@ -42,6 +60,67 @@ except ImportError:
     except ImportError:
         HAS_PYPDF = False
 
+# PDF first-content junk lines, as one alternation: page numbers, bare
+# numbers (which also covers numeric dates like 12/05/2024 and 2024-05-12)
+# and written-out dates
+_MONTHS = 'january|february|march|april|may|june|july|august|september|october|november|december'
+_JUNK_LINE_RE = re.compile(
+    r'^(?:'
+    r'page\s+\d+(?:\s+of\s+\d+)?'
+    r'|[\d\s.,\-/]+'
+    rf'|(?:{_MONTHS})\s+\d{{1,2}},?\s+\d{{4}}'
+    rf'|\d{{1,2}}\s+(?:{_MONTHS})\s+\d{{4}}'
+    r')$',
+    re.IGNORECASE,
+)
+# Characters a junk line can start with ('page', a month, or a number/separator);
+# anything else is ordinary text and never reaches the regex
+_JUNK_LINE_STARTS = frozenset('pjfmasond.,-/')
+
+# Generic PDF metadata titles that say nothing about the document
+_JUNK_TITLE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'^untitled(\s+document)?$',
+    r'^document\s*\d*$',
+    r'^microsoft\s+word\s*[-–]\s*',
+    r'^microsoft\s+excel\s*[-–]\s*',
+    r'^microsoft\s+powerpoint\s*[-–]\s*',
+    r'^adobe\s+(acrobat|reader)',
+    r'^new\s+document',
+    r'^temp\d*$',
+    r'^file\d*$',
+))
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Email HTML <body> bounds
+_BODY_OPEN_RE = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_BODY_CLOSE_RE = re.compile(r'</body>', re.IGNORECASE)
+
+# Static start of the email PDF document (doctype, stylesheet, <body>)
+_EMAIL_PDF_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.4; margin: 15px 20px; }
+        .header { background-color: #f5f5f5; padding: 15px; margin-bottom: 20px; border-radius: 4px; }
+        .header-row { margin-bottom: 5px; }
+        .header-label { font-weight: bold; color: #555; min-width: 60px; display: inline-block; }
+        .subject { font-size: 14pt; font-weight: bold; margin-top: 10px; }
+        .email-body { }
+        img { max-width: 100%; height: auto; }
+    </style>
+</head>
+<body>
+"""
+_EMAIL_PDF_HTML_TAIL = b"""</div>
+</body>
+</html>"""
+
+# Subject to filename cleaning
+_FILENAME_UNSAFE_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def is_junk_pdf_line(line):
     """
@@ -52,22 +131,13 @@ def is_junk_pdf_line(line):
     if len(line) < 5:
         return True
 
-    if re.match(r'^page\s+\d+(\s+of\s+\d+)?$', line, re.IGNORECASE):
-        return True
+    first = line[0]
+    if not first.isdigit() and first.casefold() not in _JUNK_LINE_STARTS:
+        return False
 
-    if re.match(r'^[\d\s.,\-/]+$', line):
+    if _JUNK_LINE_RE.match(line):
         return True
 
-    date_patterns = [
-        r'^\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{2,4}$',
-        r'^\d{4}[/\-\.]\d{1,2}[/\-\.]\d{1,2}$',
-        r'^(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}$',
-        r'^\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}$',
-    ]
-    for pattern in date_patterns:
-        if re.match(pattern, line, re.IGNORECASE):
-            return True
-
     return False
 
 
@@ -87,19 +157,8 @@ def is_valid_pdf_title(title, filename):
     if title.lower() == filename.lower() or title.lower() == filename_base.lower():
         return False
 
-    junk_patterns = [
-        r'^untitled(\s+document)?$',
-        r'^document\s*\d*$',
-        r'^microsoft\s+word\s*[-–]\s*',
-        r'^microsoft\s+excel\s*[-–]\s*',
-        r'^microsoft\s+powerpoint\s*[-–]\s*',
-        r'^adobe\s+(acrobat|reader)',
-        r'^new\s+document',
-        r'^temp\d*$',
-        r'^file\d*$',
-    ]
-    for pattern in junk_patterns:
-        if re.match(pattern, title, re.IGNORECASE):
+    for pattern in _JUNK_TITLE_RES:
+        if pattern.match(title):
             return False
 
     return True
@@ -109,6 +168,13 @@ def extract_pdf_metadata_title(pdf_data):
     """
     Extract the Title field from PDF metadata.
     """
+    if HAS_FITZ:
+        try:
+            with fitz.open(stream=pdf_data, filetype='pdf') as doc:
+                return (doc.metadata or {}).get('title') or None
+        except Exception:
+            pass
+
     if not HAS_PYPDF:
         return None
 
@@ -123,20 +189,52 @@ def extract_pdf_metadata_title(pdf_data):
     return None
 
 
+# Largest PDF the pypdf fallback will parse for page-1 text
+PYPDF_FIRST_PAGE_MAX_BYTES = 5 * 1024 * 1024
+
+
+def _extract_first_page_text(pdf_data):
+    """
+    Extract the raw text of page 1, via PyMuPDF if available, else pypdf
+    (only for PDFs up to PYPDF_FIRST_PAGE_MAX_BYTES).
+
+    Returns:
+        str or None: Page text, or None if the PDF has no pages or can't be read
+    """
+    if HAS_FITZ:
+        try:
+            with fitz.open(stream=pdf_data, filetype='pdf') as doc:
+                if doc.page_count == 0:
+                    return None
+                return doc.load_page(0).get_text('text')
+        except Exception:
+            pass
+
+    # pypdf indexes the whole file up front, so large (usually scanned) PDFs
+    # are not worth parsing for a 40-char snippet
+    if HAS_PYPDF and len(pdf_data) <= PYPDF_FIRST_PAGE_MAX_BYTES:
+        try:
+            reader = PdfReader(BytesIO(pdf_data), strict=False)
+            try:
+                page = reader.pages[0]
+            except IndexError:
+                return None
+            return page.extract_text()
+        except Exception:
+            pass
+
+    return None
+
+
 def extract_pdf_first_content(pdf_data, char_limit=40):
     """
     Extract the first meaningful characters from page 1 of a PDF.
     """
-    if not HAS_PYPDF:
+    if not (HAS_FITZ or HAS_PYPDF):
         return None
 
     try:
-        reader = PdfReader(BytesIO(pdf_data))
-        if len(reader.pages) == 0:
-            return None
-
-        page = reader.pages[0]
-        text = page.extract_text()
+        text = _extract_first_page_text(pdf_data)
         if not text:
             return None
 
@@ -171,19 +269,43 @@ def convert_image_to_png(image_data):
     """
     Convert image data to PNG format.
     """
+    # Already PNG (the usual case for pasted screenshots): nothing to decode
+    if image_data[:8] == _PNG_SIGNATURE:
+        return image_data
+
     if not HAS_PIL:
         return image_data
 
+    output = BytesIO()
     try:
-        img = Image.open(BytesIO(image_data))
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        output = BytesIO()
-        img.save(output, format='PNG')
-        return output.getvalue()
+        # Closing the source image frees its decoder state as soon as the PNG is encoded
+        with Image.open(BytesIO(image_data)) as img:
+            if img.mode == 'P':
+                # Only palettes with a transparent entry need the alpha path
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            if img.mode == 'RGBA':
+                # Flatten onto white (convert('RGB') would leave transparent areas black)
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel('A'))
+                img = background
+            # Fast zlib level: screenshots are written once, not served
+            img.save(output, format='PNG', optimize=False, compress_level=1)
     except Exception:
         return image_data
 
+    # BytesIO hands back its internal buffer here without another copy
+    return output.getvalue()
+
+
+@lru_cache(maxsize=256)
+def _job_number_subject_res(job_number):
+    """Compiled (job number + word, job number prefix) patterns for one job number."""
+    job_re = re.escape(job_number)
+    return (
+        re.compile(rf'^{job_re}\s+\w+'),
+        re.compile(rf'^{job_re}\s*[-:]?\s*'),
+    )
+
 
 def clean_subject_for_filename(subject, job_number):
     """
@@ -193,6 +315,7 @@ def clean_subject_for_filename(subject, job_number):
         return 'untitled'
 
     cleaned = subject.strip()
+    job_word_re, job_prefix_re = _job_number_subject_res(job_number)
 
     if ' - ' in cleaned:
         parts = cleaned.split(' - ', 1)
@@ -200,12 +323,12 @@ def clean_subject_for_filename(subject, job_number):
 
         if first_part.startswith(job_number):
             cleaned = parts[1] if len(parts) > 1 else first_part
-        elif re.match(rf'^{job_number}\s+\w+', first_part):
+        elif job_word_re.match(first_part):
             cleaned = parts[1] if len(parts) > 1 else first_part
 
-    cleaned = re.sub(rf'^{job_number}\s*[-:]?\s*', '', cleaned)
-    cleaned = re.sub(r'[<>:"/\\|?*]', '', cleaned)
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = job_prefix_re.sub('', cleaned, count=1)
+    cleaned = _FILENAME_UNSAFE_RE.sub('', cleaned)
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
     if not cleaned:
         return 'untitled'
@@ -213,16 +336,46 @@ def clean_subject_for_filename(subject, job_number):
     return cleaned
 
 
+@lru_cache(maxsize=1)
+def _weasyprint_font_config():
+    """Shared WeasyPrint font configuration (fontconfig setup is its slowest step)."""
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:  # WeasyPrint < 53
+        from weasyprint.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+def _render_pdf_weasyprint(html_content):
+    """Render UTF-8 encoded HTML to PDF bytes with WeasyPrint."""
+    return HTML(string=html_content, encoding='utf-8').write_pdf(font_config=_weasyprint_font_config())
+
+
+def _render_pdf_xhtml2pdf(html_content):
+    """Render UTF-8 encoded HTML to PDF bytes with xhtml2pdf."""
+    pdf_buffer = BytesIO()
+    pisa_status = pisa.CreatePDF(html_content, dest=pdf_buffer, encoding='utf-8')
+    if pisa_status.err:
+        raise RuntimeError(f"xhtml2pdf error count: {pisa_status.err}")
+    return pdf_buffer.getvalue()
+
+
+# Renderer chosen once at import: WeasyPrint when installed, else xhtml2pdf
+if HAS_WEASYPRINT:
+    _render_pdf = _render_pdf_weasyprint
+elif HAS_XHTML2PDF:
+    _render_pdf = _render_pdf_xhtml2pdf
+else:
+    _render_pdf = None
+
+
 def generate_email_pdf(email_data, embedded_images, job_number, projects_root):
     """
     Generate a PDF rendering of the full email with embedded images.
     """
-    import html as html_module
-    from .email_parser import extract_email_html_body
-
     logger = get_file_ops_logger(projects_root)
 
-    if not HAS_PDF_RENDERER:
+    if not HAS_PDF_RENDERER or _render_pdf is None:
         logger.warning("EMAIL PDF SKIP | No PDF renderer installed (weasyprint or xhtml2pdf)")
         return (None, None)
 
@@ -237,51 +390,28 @@ def generate_email_pdf(email_data, embedded_images, job_number, projects_root):
     cc_addr = html_module.escape(email_data.get('cc', ''))
     subject_escaped = html_module.escape(subject)
 
-    html_body = None
+    # parse_eml_file already decoded the HTML body; only re-walk older dicts
+    html_body = email_data.get('html_body')
     raw_msg = email_data.get('_raw_message')
-    if raw_msg:
+    if 'html_body' not in email_data and raw_msg:
         html_body = extract_email_html_body(raw_msg)
 
-    image_map = {}
-    for img in embedded_images:
-        cid = img.get('content_id', '')
-        if cid:
-            b64_data = base64.b64encode(img['data']).decode('utf-8')
-            mime_type = img.get('content_type', 'image/png')
-            image_map[cid] = f"data:{mime_type};base64,{b64_data}"
-
     if html_body:
-        body_content = html_body
-        for cid, data_url in image_map.items():
-            body_content = body_content.replace(f'cid:{cid}', data_url)
-            body_content = body_content.replace(f'CID:{cid}', data_url)
-
-        body_match = re.search(r'<body[^>]*>(.*?)</body>', body_content, re.DOTALL | re.IGNORECASE)
-        if body_match:
-            body_html = body_match.group(1)
-        else:
-            body_html = body_content
+        # Inner HTML of the first <body>...</body>: two forward searches, so
+        # long bodies aren't walked char by char by a lazy (.*?) group
+        body_html = html_body
+        body_open = _BODY_OPEN_RE.search(html_body)
+        if body_open:
+            body_close = _BODY_CLOSE_RE.search(html_body, body_open.end())
+            if body_close:
+                body_html = html_body[body_open.end():body_close.start()]
     else:
         body_text = email_data.get('body', '')
         body_html = html_module.escape(body_text).replace('\n', '<br>')
 
     cc_row = f"<div class='header-row'><span class='header-label'>CC:</span> {cc_addr}</div>" if cc_addr else ""
 
-    html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        body {{ font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.4; margin: 15px 20px; }}
-        .header {{ background-color: #f5f5f5; padding: 15px; margin-bottom: 20px; border-radius: 4px; }}
-        .header-row {{ margin-bottom: 5px; }}
-        .header-label {{ font-weight: bold; color: #555; min-width: 60px; display: inline-block; }}
-        .subject {{ font-size: 14pt; font-weight: bold; margin-top: 10px; }}
-        .email-body {{ }}
-        img {{ max-width: 100%; height: auto; }}
-    </style>
-</head>
-<body>
+    page_head = f"""{_EMAIL_PDF_HTML_HEAD}\
     <div class="header">
         <div class="header-row"><span class="header-label">From:</span> {from_addr}</div>
         <div class="header-row"><span class="header-label">To:</span> {to_addr}</div>
@@ -289,23 +419,36 @@ def generate_email_pdf(email_data, embedded_images, job_number, projects_root):
         <div class="header-row"><span class="header-label">Date:</span> {email_date.strftime('%Y-%m-%d %H:%M')}</div>
         <div class="subject">{subject_escaped}</div>
     </div>
-    <div class="email-body">{body_html}</div>
-</body>
-</html>"""
+    <div class="email-body">"""
 
     try:
-        if HAS_WEASYPRINT:
-            html_obj = HTML(string=html_content)
-            pdf_data = html_obj.write_pdf()
-        elif HAS_XHTML2PDF:
-            pdf_buffer = BytesIO()
-            pisa_status = pisa.CreatePDF(html_content, dest=pdf_buffer)
-            if pisa_status.err:
-                logger.error(f"EMAIL PDF FAILED | xhtml2pdf error count: {pisa_status.err}")
-                return (None, None)
-            pdf_data = pdf_buffer.getvalue()
-        else:
-            return (None, None)
+        body_bytes = body_html.encode('utf-8')
+
+        # Data URLs stay bytes: they are spliced into the UTF-8 encoded body, so
+        # large base64 payloads are never widened into (possibly UCS-2/4) str.
+        # Only the HTML path has cid: references, and images the body never
+        # cites (a cheap substring test) aren't base64 encoded at all
+        image_map = {}
+        for img in (embedded_images if html_body else ()):
+            cid = img.get('content_id', '')
+            if not cid:
+                continue
+            cid = cid.encode('utf-8')
+            if b'cid:' + cid not in body_bytes and b'CID:' + cid not in body_bytes:
+                continue
+            b64_data = binascii.b2a_base64(img['data'], newline=False)
+            mime_type = img.get('content_type', 'image/png')
+            image_map[cid] = b'data:%s;base64,%s' % (mime_type.encode('utf-8'), b64_data)
+
+        if image_map:
+            # One pass over the HTML for every CID; longest first so 'img1'
+            # never claims the start of 'img10'
+            cids = sorted(image_map, key=len, reverse=True)
+            cid_re = re.compile(b'(?:cid|CID):(' + b'|'.join(map(re.escape, cids)) + b')')
+            body_bytes = cid_re.sub(lambda m: image_map[m.group(1)], body_bytes)
+
+        html_content = b''.join((page_head.encode('utf-8'), body_bytes, _EMAIL_PDF_HTML_TAIL))
+        pdf_data = _render_pdf(html_content)
 
         if not pdf_data or len(pdf_data) == 0:
             logger.error("EMAIL PDF FAILED | Generated PDF is empty")
@@ -314,7 +457,6 @@ def generate_email_pdf(email_data, embedded_images, job_number, projects_root):
         logger.info(f"EMAIL PDF OK | Generated {len(pdf_data)} bytes for {filename}")
         return (pdf_data, filename)
     except Exception as e:
-        import traceback
         logger.error(f"EMAIL PDF FAILED | {e}\n{traceback.format_exc()}")
         return (None, None)
 
@@ -331,32 +473,56 @@ def generate_screenshot_filenames(job_number, email_date, count):
     return filenames
 
 
-def check_unique_pdf_filename(dest_folder, filename):
+def check_unique_pdf_filename(dest_folder, filename, taken=()):
     """
     Ensure PDF filename is unique, adding letter suffix if needed.
+
+    taken lists names already claimed in dest_folder that are not on disk
+    yet (e.g. by a write still to come), which are treated as existing.
     """
     dest_folder = Path(dest_folder)
-    if not (dest_folder / filename).exists():
+    taken = {name.casefold() for name in taken}
+    if filename.casefold() not in taken and not (dest_folder / filename).exists():
         return filename
 
+    # Taken: list the folder once rather than stat up to 24 candidates. Names
+    # compare casefolded, so case-insensitive filesystems can't collide
     base, ext = os.path.splitext(filename)
-    for letter in 'bcdefghijklmnopqrstuvwxyz':
-        new_filename = f"{base}_{letter}{ext}"
-        if not (dest_folder / new_filename).exists():
-            return new_filename
+    try:
+        with os.scandir(dest_folder) as entries:
+            existing = {entry.name.casefold() for entry in entries}
+    except OSError:
+        # Can't list the folder: check each candidate on disk instead
+        for letter in 'bcdefghijklmnopqrstuvwxyz':
+            new_filename = f"{base}_{letter}{ext}"
+            if new_filename.casefold() not in taken and not (dest_folder / new_filename).exists():
+                return new_filename
+    else:
+        existing |= taken
+        # Casefolding maps character by character, so fold base and extension once
+        folded_base, folded_ext = base.casefold(), ext.casefold()
+        letter = next((letter for letter in 'bcdefghijklmnopqrstuvwxyz'
+                       if f"{folded_base}_{letter}{folded_ext}" not in existing), None)
+        if letter is not None:
+            return f"{base}_{letter}{ext}"
 
     timestamp = datetime.now().strftime('%H%M%S')
     return f"{base}_{timestamp}{ext}"
 
 
+def _is_outbound_email(email_data):
+    """Check whether the email was sent by us (uses parse_eml_file's lowercased sender)."""
+    from_lower = email_data.get('_from_addr_lower')
+    if from_lower is not None:
+        return is_my_email_lower(from_lower)
+    return is_my_email(email_data.get('from', ''))
+
+
 def should_capture_outbound_email(email_data, embedded_images):
     """
     Determine if an outbound email should trigger screenshot/PDF capture.
     """
-    from .email_parser import is_my_email
-
-    from_addr = email_data.get('from', '')
-    if not is_my_email(from_addr):
+    if not _is_outbound_email(email_data):
         return False
 
     return len(embedded_images) > 0
@@ -367,14 +533,15 @@ def process_outbound_email_capture(msg, email_data, job_number, dest_folder, pro
     """
     Process an outbound email for screenshot extraction and PDF generation.
     """
-    from .email_parser import extract_embedded_images
-
     logger = get_file_ops_logger(projects_root)
     result = {'screenshots': [], 'pdf_filename': None, 'success': True}
 
-    embedded_images = extract_embedded_images(msg)
+    # Sender check first: inbound emails (the common case) skip the MIME walk
+    if not _is_outbound_email(email_data):
+        return result
 
-    if not should_capture_outbound_email(email_data, embedded_images):
+    embedded_images = extract_embedded_images(msg)
+    if not embedded_images:
         return result
 
     logger.info(f"OUTBOUND EMAIL CAPTURE | Found {len(embedded_images)} embedded image(s) > 20KB")
@@ -387,36 +554,65 @@ def process_outbound_email_capture(msg, email_data, job_number, dest_folder, pro
         all_destinations.append(keystage_folder)
 
     screenshot_filenames = generate_screenshot_filenames(job_number, email_date, len(embedded_images))
+    # Plain string joins per file; safe_write_attachment builds the Path once
+    dest_strs = [os.fspath(dest) for dest in all_destinations]
+    # A secondary or keystage folder can be the primary folder itself; writes
+    # run concurrently, so each folder must get its own paths up front
+    folder_keys = [os.path.normcase(os.path.normpath(dest)) for dest in dest_strs]
+    # Screenshots are identical in every folder: write once per folder
+    screenshot_dests = list(dict(zip(folder_keys, dest_strs)).items())
+
+    def write_screenshot(dest, filename, png_data):
+        try:
+            if safe_write_attachment(os.path.join(dest, filename), png_data, projects_root, f"screenshot:{filename}"):
+                logger.info(f"SCREENSHOT SAVED | {filename} -> {dest}")
+                return True
+        except Exception as e:
+            logger.error(f"SCREENSHOT FAILED | {filename} -> {dest}: {e}")
+            result['success'] = False
+        return False
 
-    for i, img in enumerate(embedded_images):
-        filename = screenshot_filenames[i]
-        png_data = convert_image_to_png(img['data'])
-
-        for dest in all_destinations:
-            dest_path = Path(dest) / filename
-            try:
-                if safe_write_attachment(dest_path, png_data, projects_root, f"screenshot:{filename}"):
-                    if dest == dest_folder:
-                        result['screenshots'].append(filename)
-                    logger.info(f"SCREENSHOT SAVED | {filename} -> {dest}")
-            except Exception as e:
-                logger.error(f"SCREENSHOT FAILED | {filename} -> {dest}: {e}")
-                result['success'] = False
-
-    pdf_data, pdf_filename = generate_email_pdf(email_data, embedded_images, job_number, projects_root)
-
-    if pdf_data and pdf_filename:
-        for dest in all_destinations:
-            unique_filename = check_unique_pdf_filename(dest, pdf_filename)
-            dest_path = Path(dest) / unique_filename
+    def write_pdf(dest, pdf_data, unique_filename):
+        try:
+            if safe_write_attachment(os.path.join(dest, unique_filename), pdf_data, projects_root,
+                                     f"email_pdf:{unique_filename}"):
+                logger.info(f"EMAIL PDF SAVED | {unique_filename} -> {dest}")
+                return unique_filename
+        except Exception as e:
+            logger.error(f"EMAIL PDF FAILED | {unique_filename} -> {dest}: {e}")
+            result['success'] = False
+        return None
 
-            try:
-                if safe_write_attachment(dest_path, pdf_data, projects_root, f"email_pdf:{unique_filename}"):
-                    if dest == dest_folder:
-                        result['pdf_filename'] = unique_filename
-                    logger.info(f"EMAIL PDF SAVED | {unique_filename} -> {dest}")
-            except Exception as e:
-                logger.error(f"EMAIL PDF FAILED | {unique_filename} -> {dest}: {e}")
-                result['success'] = False
+    # Destinations are independent (often separate network shares), so each
+    # file is written to all of them concurrently
+    with ThreadPoolExecutor(max_workers=len(all_destinations)) as pool:
+        for i, img in enumerate(embedded_images):
+            filename = screenshot_filenames[i]
+            png_data = convert_image_to_png(img['data'])
+
+            written = dict(zip(
+                (key for key, _ in screenshot_dests),
+                pool.map(lambda item: write_screenshot(item[1], filename, png_data), screenshot_dests),
+            ))
+            if written[folder_keys[0]]:
+                result['screenshots'].append(filename)
+
+        pdf_data, pdf_filename = generate_email_pdf(email_data, embedded_images, job_number, projects_root)
+
+        if pdf_data and pdf_filename:
+            # Resolve names serially so a folder listed twice gets a second,
+            # suffixed copy (as with sequential writes) instead of a clash
+            claimed = {}
+            pdf_targets = []
+            for key, dest in zip(folder_keys, dest_strs):
+                names = claimed.setdefault(key, [])
+                unique_filename = check_unique_pdf_filename(dest, pdf_filename, taken=names)
+                names.append(unique_filename)
+                pdf_targets.append((dest, unique_filename))
+
+            written = pool.map(lambda target: write_pdf(target[0], pdf_data, target[1]), pdf_targets)
+            for dest, unique_filename in zip(all_destinations, written):
+                if unique_filename and dest == dest_folder:
+                    result['pdf_filename'] = unique_filename
 
     return result
@@ -15,6 +15,7 @@ from .dialogs import (
     DuplicateEmailDialog,
     FileDuplicateDialog,
     DifferentLocationDuplicateDialog,
+    register_dialog_styles,
 )
 
 __all__ = [
@@ -31,4 +32,5 @@ __all__ = [
     'DuplicateEmailDialog',
     'FileDuplicateDialog',
     'DifferentLocationDuplicateDialog',
+    'register_dialog_styles',
 ]
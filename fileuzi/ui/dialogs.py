@@ -4,32 +4,226 @@ Dialog components for FileUzi.
 
 import os
 import re
+import time
+from pathlib import Path
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog
+    QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 )
-from PyQt6.QtCore import Qt, QUrl
-from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 
 from fileuzi.config import COLORS
 from fileuzi.database import get_database_path
 from fileuzi.utils import get_file_ops_logger
 
+# Trailing _vN version suffix on a file's base name
+_VERSION_RE = re.compile(r'_v(\d+)$')
+
+# Application-wide stylesheet for every FileUzi dialog, registered on the
+# application so Qt parses it once rather than per dialog. Rules are scoped to dialogs carrying
+# the fileuziDialog property and to child objectNames, so the main window and
+# child windows such as the file picker are untouched. Placeholders are
+# COLORS keys.
+_DIALOG_STYLE_TEMPLATE = """
+    QDialog[fileuziDialog="true"] QLabel#warning {{
+        color: {warning};
+        font-size: 14px;
+        font-weight: bold;
+    }}
+    QDialog[fileuziDialog="true"] QLabel#info {{
+        color: {text_secondary};
+        font-size: 12px;
+    }}
+    QDialog[fileuziDialog="true"] QLabel#heading {{
+        color: {text};
+        font-size: 13px;
+        font-weight: bold;
+    }}
+    QDialog[fileuziDialog="true"] QLabel#details {{
+        color: {text};
+        font-size: 12px;
+    }}
+    QDialog[fileuziDialog="true"] QPushButton#optionBtn {{
+        background-color: {bg};
+        color: {text};
+        border: 1px solid {border};
+        border-radius: 6px;
+        padding: 10px 16px;
+        text-align: left;
+        font-size: 12px;
+    }}
+    QDialog[fileuziDialog="true"] QPushButton#optionBtn:hover {{
+        background-color: {primary}11;
+        border-color: {primary};
+    }}
+    QDialog#databaseMissingDialog QPushButton#optionBtn {{
+        padding: 12px 16px;
+    }}
+    QDialog[fileuziDialog="true"] QLabel#message {{
+        font-size: 14px;
+    }}
+    QDialog[fileuziDialog="true"] QLabel#folderLink {{
+        color: #2563eb;
+        text-decoration: underline;
+        font-size: 12px;
+    }}
+    QDialog[fileuziDialog="true"] QPushButton#primary {{
+        background-color: #2563eb;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 24px;
+        font-weight: 500;
+    }}
+    QDialog[fileuziDialog="true"] QPushButton#primary:hover {{
+        background-color: #1d4ed8;
+    }}
+"""
+
+_DIALOG_STYLE = _DIALOG_STYLE_TEMPLATE.format_map(COLORS)
+
+
+def register_dialog_styles(app):
+    """
+    Add the dialog stylesheet to the application's stylesheet if it is missing.
+
+    Call at startup, before any dialog is shown; dialogs also call it as they
+    are built, which re-adds the rules if app.setStyleSheet() has since
+    replaced them. Any stylesheet the application already has is kept.
+    """
+    if app is None:
+        return
+    sheet = app.styleSheet()
+    if _DIALOG_STYLE not in sheet:
+        app.setStyleSheet(sheet + _DIALOG_STYLE)
+
+
+def _file_details_text(location, stat):
+    """Location, size and modified lines for a duplicate dialog (location only without a stat)."""
+    if stat is None:
+        return f"  Location: {location}"
+    size_mb = stat.st_size / (1024 * 1024)
+    modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(stat.st_mtime))
+    return (
+        f"  Location: {location}\n"
+        f"  Size: {size_mb:.1f} MB\n"
+        f"  Modified: {modified}"
+    )
+
+
+class _StatSignals(QObject):
+    """Carries a background stat result back to the GUI thread."""
+
+    finished = pyqtSignal(object)  # os.stat_result, or None if the stat failed
+
+
+class _StatRunnable(QRunnable):
+    """Stats one path on a thread pool thread."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = _StatSignals()
+
+    def run(self):
+        try:
+            stat = os.stat(self.path)
+        except Exception:
+            stat = None
+        self.signals.finished.emit(stat)
+
+
+def _stat_in_background(path, callback):
+    """
+    Stat path on the global thread pool and deliver the result to callback.
+
+    A duplicate on a slow network share would otherwise hold up the dialog;
+    callback (a dialog method) is invoked on the GUI thread with the
+    os.stat_result, or None if the file is missing or unreadable.
+    """
+    runnable = _StatRunnable(path)
+    runnable.signals.finished.connect(callback)
+    QThreadPool.globalInstance().start(runnable)
+
+
+def _make_dialog_layout(dialog):
+    """
+    Create the dialog's top-level layout with the standard spacing and margins.
+
+    Also marks the dialog for the application-wide dialog stylesheet before
+    any child widget exists, so children are polished once as they are added.
+    """
+    register_dialog_styles(QApplication.instance())
+    dialog.setProperty("fileuziDialog", True)
+    layout = QVBoxLayout(dialog)
+    layout.setSpacing(16)
+    layout.setContentsMargins(24, 24, 24, 24)
+    return layout
+
+
+def _add_label(layout, text, name, word_wrap=False):
+    """Add a label styled by the dialog stylesheet rule for its objectName."""
+    label = QLabel(text)
+    label.setObjectName(name)
+    if word_wrap:
+        label.setWordWrap(True)
+    layout.addWidget(label)
+    return label
+
+
+def _add_option_button(layout, text, slot, default=False):
+    """Add a left-aligned option button (styled by the dialog's optionBtn rule)."""
+    btn = QPushButton(text)
+    btn.setObjectName("optionBtn")
+    if default:
+        btn.setDefault(True)
+    btn.clicked.connect(slot)
+    layout.addWidget(btn)
+    return btn
+
+
+class _ClickableLabel(QLabel):
+    """Plain-text label that emits clicked on a left-button press."""
+
+    clicked = pyqtSignal()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.clicked.emit()
+        super().mousePressEvent(event)
 
-class SuccessDialog(QDialog):
+
+class _DeferredSetupMixin:
+    """
+    Builds a dialog's widgets (setup_ui) the first time it is shown.
+
+    exec(), open() and show() all go through setVisible(True), so a dialog
+    that is constructed but never shown costs no widgets or style polish.
+    """
+
+    _ui_built = False
+
+    def setVisible(self, visible):
+        if visible and not self._ui_built:
+            self._ui_built = True
+            self.setup_ui()
+        super().setVisible(visible)
+
+
+class SuccessDialog(_DeferredSetupMixin, QDialog):
     """Custom success dialog with clickable folder link."""
 
     def __init__(self, parent, message_or_count, dest_folder):
         super().__init__(parent)
+        self.message_or_count = message_or_count
         self.dest_folder = dest_folder
+        self._dest_folder_str = str(dest_folder)
         self.setWindowTitle("Success")
         self.setModal(True)
-        self.setup_ui(message_or_count)
 
-    def setup_ui(self, message_or_count):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(16)
-        layout.setContentsMargins(24, 24, 24, 24)
+    def setup_ui(self):
+        message_or_count = self.message_or_count
+        layout = _make_dialog_layout(self)
 
         # Success message - handle both string and int
         if isinstance(message_or_count, str):
@@ -37,16 +231,15 @@ class SuccessDialog(QDialog):
         else:
             msg_text = f"Filed {message_or_count} item(s)"
 
-        message = QLabel(f"{msg_text}\n\nPrimary location:")
-        message.setStyleSheet("font-size: 14px;")
-        layout.addWidget(message)
+        _add_label(layout, f"{msg_text}\n\nPrimary location:", "message")
 
-        # Clickable folder link
-        folder_link = QLabel(f'<a href="file://{self.dest_folder}" style="color: #2563eb;">{self.dest_folder}</a>')
-        folder_link.setStyleSheet("font-size: 12px;")
+        # Clickable folder link (plain text styled as a link, so Qt's
+        # rich-text engine is never involved)
+        folder_link = _ClickableLabel(self._dest_folder_str)
+        folder_link.setTextFormat(Qt.TextFormat.PlainText)
+        folder_link.setObjectName("folderLink")
         folder_link.setWordWrap(True)
-        folder_link.setOpenExternalLinks(False)
-        folder_link.linkActivated.connect(self.on_link_clicked)
+        folder_link.clicked.connect(self.on_link_clicked)
         folder_link.setCursor(Qt.CursorShape.PointingHandCursor)
         layout.addWidget(folder_link)
 
@@ -55,19 +248,7 @@ class SuccessDialog(QDialog):
         button_layout.addStretch()
 
         ok_btn = QPushButton("OK")
-        ok_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2563eb;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 24px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background-color: #1d4ed8;
-            }
-        """)
+        ok_btn.setObjectName("primary")
         ok_btn.clicked.connect(self.accept)
         button_layout.addWidget(ok_btn)
 
@@ -75,13 +256,17 @@ class SuccessDialog(QDialog):
 
         self.setMinimumWidth(400)
 
-    def on_link_clicked(self, link):
-        """Open folder and close dialog."""
-        QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.dest_folder)))
+    def on_link_clicked(self):
+        """Open the destination folder and close dialog."""
+        # Only needed when the link is clicked, so imported here
+        from PyQt6.QtCore import QUrl
+        from PyQt6.QtGui import QDesktopServices
+
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self._dest_folder_str))
         self.accept()
 
 
-class DatabaseMissingDialog(QDialog):
+class DatabaseMissingDialog(_DeferredSetupMixin, QDialog):
     """Dialog shown when filing database is missing at the project root."""
 
     def __init__(self, parent, new_root_path, old_root_path=None):
@@ -90,76 +275,51 @@ class DatabaseMissingDialog(QDialog):
         self.old_root_path = old_root_path
         self.result_action = None
         self.imported_db_path = None
+        self.old_db_path = None  # Previous root's database, set when it can be copied
+        self.setObjectName("databaseMissingDialog")
         self.setWindowTitle("Filing Database Not Found")
         self.setModal(True)
-        self.setup_ui()
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(16)
-        layout.setContentsMargins(24, 24, 24, 24)
+        layout = _make_dialog_layout(self)
 
         # Warning icon and message
-        warning_label = QLabel(f"⚠ No filing database found at:\n\n{self.new_root_path}")
-        warning_label.setStyleSheet(f"color: {COLORS['warning']}; font-size: 14px; font-weight: bold;")
-        warning_label.setWordWrap(True)
-        layout.addWidget(warning_label)
+        _add_label(layout, f"⚠ No filing database found at:\n\n{self.new_root_path}", "warning",
+                   word_wrap=True)
 
-        info_label = QLabel("The filing database tracks previously filed emails to prevent duplicates.")
-        info_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px;")
-        info_label.setWordWrap(True)
-        layout.addWidget(info_label)
+        # Fixed one-line text: no word wrap, so Qt can skip the wrapping text layout
+        _add_label(layout, "The filing database tracks previously filed emails to prevent duplicates.",
+                   "info")
 
         # Options
-        options_label = QLabel("Options:")
-        options_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 13px; font-weight: bold;")
-        layout.addWidget(options_label)
-
-        # Option A - Create new
-        btn_create = QPushButton("a) Create a new empty database here")
-        btn_create.setStyleSheet(self._button_style())
-        btn_create.clicked.connect(self.on_create_new)
-        layout.addWidget(btn_create)
-
-        # Option B - Import
-        btn_import = QPushButton("b) Import existing database from another location...")
-        btn_import.setStyleSheet(self._button_style())
-        btn_import.clicked.connect(self.on_import)
-        layout.addWidget(btn_import)
+        _add_label(layout, "Options:", "heading")
+
+        options = [
+            ("a) Create a new empty database here", self.on_create_new),
+            ("b) Import existing database from another location...", self.on_import),
+        ]
 
         # Option C - Copy from old (only if old path exists and has db)
         if self.old_root_path and self.old_root_path != self.new_root_path:
             old_db = get_database_path(self.old_root_path)
             if old_db.exists():
-                btn_copy = QPushButton(f"c) Copy database from previous root:\n{self.old_root_path}")
-                btn_copy.setStyleSheet(self._button_style())
-                btn_copy.clicked.connect(self.on_copy_from_old)
-                layout.addWidget(btn_copy)
+                self.old_db_path = old_db
+                options.append(
+                    (f"c) Copy database from previous root:\n{self.old_root_path}", self.on_copy_from_old)
+                )
 
-        self.setMinimumWidth(500)
+        for text, slot in options:
+            _add_option_button(layout, text, slot)
 
-    def _button_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['text']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 12px 16px;
-                text-align: left;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['primary']}11;
-                border-color: {COLORS['primary']};
-            }}
-        """
+        self.setMinimumWidth(500)
 
     def on_create_new(self):
         self.result_action = 'create'
         self.accept()
 
     def on_import(self):
+        from PyQt6.QtWidgets import QFileDialog
+
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select Filing Database",
@@ -176,7 +336,7 @@ class DatabaseMissingDialog(QDialog):
         self.accept()
 
 
-class DuplicateEmailDialog(QDialog):
+class DuplicateEmailDialog(_DeferredSetupMixin, QDialog):
     """Dialog shown when a duplicate email is detected."""
 
     def __init__(self, parent, filed_at, filed_to, filed_also=None):
@@ -187,57 +347,28 @@ class DuplicateEmailDialog(QDialog):
         self.result_action = None
         self.setWindowTitle("Duplicate Email Detected")
         self.setModal(True)
-        self.setup_ui()
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(16)
-        layout.setContentsMargins(24, 24, 24, 24)
+        layout = _make_dialog_layout(self)
 
         # Warning message
-        warning_label = QLabel("This email was already filed:")
-        warning_label.setStyleSheet(f"color: {COLORS['warning']}; font-size: 14px; font-weight: bold;")
-        layout.addWidget(warning_label)
+        _add_label(layout, "This email was already filed:", "warning")
 
         # Filing details
-        details = f"• Filed on: {self.filed_at}\n• Primary location: {self.filed_to}"
+        details = [f"• Filed on: {self.filed_at}", f"• Primary location: {self.filed_to}"]
         if self.filed_also:
-            details += f"\n• Also filed to: {self.filed_also}"
-        details_label = QLabel(details)
-        details_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
-        details_label.setWordWrap(True)
-        layout.addWidget(details_label)
+            details.append(f"• Also filed to: {self.filed_also}")
+        _add_label(layout, "\n".join(details), "details", word_wrap=True)
 
         # Options
-        btn_file_again = QPushButton("a) File again to new destination (updates record)")
-        btn_file_again.setStyleSheet(self._button_style())
-        btn_file_again.clicked.connect(self.on_file_again)
-        layout.addWidget(btn_file_again)
-
-        btn_skip = QPushButton("b) Skip - don't file this email")
-        btn_skip.setStyleSheet(self._button_style())
-        btn_skip.clicked.connect(self.on_skip)
-        layout.addWidget(btn_skip)
+        for text, slot in (
+            ("a) File again to new destination (updates record)", self.on_file_again),
+            ("b) Skip - don't file this email", self.on_skip),
+        ):
+            _add_option_button(layout, text, slot)
 
         self.setMinimumWidth(450)
 
-    def _button_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['text']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 10px 16px;
-                text-align: left;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['primary']}11;
-                border-color: {COLORS['primary']};
-            }}
-        """
-
     def on_file_again(self):
         self.result_action = 'file_again'
         self.accept()
@@ -247,7 +378,7 @@ class DuplicateEmailDialog(QDialog):
         self.accept()
 
 
-class FileDuplicateDialog(QDialog):
+class FileDuplicateDialog(_DeferredSetupMixin, QDialog):
     """Dialog shown when a duplicate file is detected at the same location."""
 
     def __init__(self, parent, filename, duplicate_locations, projects_root,
@@ -257,126 +388,79 @@ class FileDuplicateDialog(QDialog):
         self.duplicate_locations = duplicate_locations
         self.projects_root = projects_root
         self.destination_folder = destination_folder
+        self._logger = get_file_ops_logger(projects_root)
         self.result_action = None
         self.new_filename = None
         self.replace_target = None  # Path of file to replace
         self.setWindowTitle("Duplicate File Detected")
         self.setModal(True)
-        self.setup_ui()
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(16)
-        layout.setContentsMargins(24, 24, 24, 24)
+        layout = _make_dialog_layout(self)
 
         # Warning message
-        warning_label = QLabel(f"File '{self.filename}' already exists:")
-        warning_label.setStyleSheet(f"color: {COLORS['warning']}; font-size: 14px; font-weight: bold;")
-        warning_label.setWordWrap(True)
-        layout.addWidget(warning_label)
+        _add_label(layout, f"File '{self.filename}' already exists:", "warning", word_wrap=True)
 
-        # Show file details for first duplicate
+        # Show file details for first duplicate (size and modified time are
+        # filled in once the background stat returns)
         first_dup = self.duplicate_locations[0]
-        try:
-            from pathlib import Path
-            dup_path = Path(first_dup)
-            if dup_path.exists():
-                stat = dup_path.stat()
-                size_mb = stat.st_size / (1024 * 1024)
-                from datetime import datetime
-                modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                details_text = (
-                    f"  Location: {first_dup}\n"
-                    f"  Size: {size_mb:.1f} MB\n"
-                    f"  Modified: {modified}"
-                )
-            else:
-                details_text = f"  Location: {first_dup}"
-        except Exception:
-            details_text = f"  Location: {first_dup}"
-
+        dup_path = Path(first_dup)
+        self._details_suffix = ""
         if len(self.duplicate_locations) > 1:
-            details_text += f"\n\n... and {len(self.duplicate_locations) - 1} more location(s)"
+            self._details_suffix = f"\n\n... and {len(self.duplicate_locations) - 1} more location(s)"
 
-        details_label = QLabel(details_text)
-        details_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
-        details_label.setWordWrap(True)
-        layout.addWidget(details_label)
-
-        # Options
-        btn_skip = QPushButton("a) Skip - don't copy this file")
-        btn_skip.setStyleSheet(self._button_style())
-        btn_skip.clicked.connect(self.on_skip)
-        layout.addWidget(btn_skip)
-
-        btn_rename = QPushButton("b) Rename - add _v2 suffix")
-        btn_rename.setStyleSheet(self._button_style())
-        btn_rename.setDefault(True)
-        btn_rename.clicked.connect(self.on_rename)
-        layout.addWidget(btn_rename)
-
-        # Determine Superseded folder name for display
-        from pathlib import Path
-        dup_parent = Path(first_dup).parent.name
-        btn_replace = QPushButton(
-            f"c) Replace (moves old to {dup_parent}/Superseded)"
+        self.details_label = _add_label(
+            layout, _file_details_text(first_dup, None) + self._details_suffix, "details", word_wrap=True
         )
-        btn_replace.setStyleSheet(self._button_style())
-        btn_replace.clicked.connect(self.on_replace)
-        layout.addWidget(btn_replace)
+        _stat_in_background(first_dup, self._on_duplicate_stat)
+
+        # Options (the replace option names the Superseded folder it moves to)
+        dup_parent = dup_path.parent.name
+        for text, slot, default in (
+            ("a) Skip - don't copy this file", self.on_skip, False),
+            ("b) Rename - add _v2 suffix", self.on_rename, True),
+            (f"c) Replace (moves old to {dup_parent}/Superseded)", self.on_replace, False),
+        ):
+            _add_option_button(layout, text, slot, default)
 
         self.setMinimumWidth(500)
 
-    def _button_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['text']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 10px 16px;
-                text-align: left;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['primary']}11;
-                border-color: {COLORS['primary']};
-            }}
-        """
+    def _on_duplicate_stat(self, stat):
+        if stat is not None:
+            self.details_label.setText(
+                _file_details_text(self.duplicate_locations[0], stat) + self._details_suffix
+            )
 
     def on_skip(self):
         self.result_action = 'skip'
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(f"DUPLICATE SKIP | {self.filename} | Existing at: {self.duplicate_locations[0]}")
+        self._logger.info("DUPLICATE SKIP | %s | Existing at: %s", self.filename, self.duplicate_locations[0])
         self.accept()
 
     def on_rename(self):
         self.result_action = 'rename'
         # Generate new filename with _v2 suffix (or increment if _v2 exists)
         base, ext = os.path.splitext(self.filename)
-        version_match = re.search(r'_v(\d+)$', base)
+        version_match = _VERSION_RE.search(base)
         if version_match:
             current_version = int(version_match.group(1))
             base = base[:version_match.start()]
             self.new_filename = f"{base}_v{current_version + 1}{ext}"
         else:
             self.new_filename = f"{base}_v2{ext}"
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(f"DUPLICATE RENAME | {self.filename} -> {self.new_filename}")
+        self._logger.info("DUPLICATE RENAME | %s -> %s", self.filename, self.new_filename)
         self.accept()
 
     def on_replace(self):
         self.result_action = 'replace'
         self.replace_target = self.duplicate_locations[0]
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(
-            f"DUPLICATE REPLACE | {self.filename} | "
-            f"Superseding: {self.duplicate_locations[0]}"
+        self._logger.info(
+            "DUPLICATE REPLACE | %s | Superseding: %s",
+            self.filename, self.duplicate_locations[0]
         )
         self.accept()
 
 
-class DifferentLocationDuplicateDialog(QDialog):
+class DifferentLocationDuplicateDialog(_DeferredSetupMixin, QDialog):
     """Dialog shown when a duplicate exists at a different location than the filing target."""
 
     def __init__(self, parent, filename, existing_path, new_destination,
@@ -386,125 +470,74 @@ class DifferentLocationDuplicateDialog(QDialog):
         self.existing_path = existing_path
         self.new_destination = new_destination
         self.projects_root = projects_root
+        self._logger = get_file_ops_logger(projects_root)
         self.result_action = None
         self.replace_target = None
         self.setWindowTitle("File Exists at Different Location")
         self.setModal(True)
-        self.setup_ui()
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setSpacing(16)
-        layout.setContentsMargins(24, 24, 24, 24)
+        layout = _make_dialog_layout(self)
 
         # Warning message
-        warning_label = QLabel(f"File '{self.filename}' already exists at a different location:")
-        warning_label.setStyleSheet(f"color: {COLORS['warning']}; font-size: 14px; font-weight: bold;")
-        warning_label.setWordWrap(True)
-        layout.addWidget(warning_label)
+        _add_label(layout, f"File '{self.filename}' already exists at a different location:", "warning",
+                   word_wrap=True)
 
-        # Show existing file details
-        from pathlib import Path
+        # Show existing file details (size and modified time are filled in
+        # once the background stat returns)
         existing = Path(self.existing_path)
-        try:
-            if existing.exists():
-                stat = existing.stat()
-                size_mb = stat.st_size / (1024 * 1024)
-                from datetime import datetime
-                modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                existing_text = (
-                    f"  Location: {self.existing_path}\n"
-                    f"  Size: {size_mb:.1f} MB\n"
-                    f"  Modified: {modified}"
-                )
-            else:
-                existing_text = f"  Location: {self.existing_path}"
-        except Exception:
-            existing_text = f"  Location: {self.existing_path}"
+        dest_path = Path(self.new_destination)
 
-        existing_label = QLabel(existing_text)
-        existing_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
-        existing_label.setWordWrap(True)
-        layout.addWidget(existing_label)
+        self.existing_label = _add_label(
+            layout, _file_details_text(self.existing_path, None), "details", word_wrap=True
+        )
+        _stat_in_background(self.existing_path, self._on_existing_stat)
 
         # Show target destination
-        dest_label = QLabel(f"\nYou are filing to:\n  {self.new_destination}")
-        dest_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
-        dest_label.setWordWrap(True)
-        layout.addWidget(dest_label)
+        _add_label(layout, f"\nYou are filing to:\n  {self.new_destination}", "details", word_wrap=True)
 
-        info_label = QLabel("These are different locations. Choose action:")
-        info_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px;")
-        layout.addWidget(info_label)
+        _add_label(layout, "These are different locations. Choose action:", "info")
 
         # Options
         existing_parent_name = existing.parent.name
-
-        btn_skip = QPushButton("a) Skip - don't file anywhere")
-        btn_skip.setStyleSheet(self._button_style())
-        btn_skip.clicked.connect(self.on_skip)
-        layout.addWidget(btn_skip)
-
-        dest_name = Path(self.new_destination).name
-        btn_file_new = QPushButton(
-            f"b) File to {dest_name} - keep both files in different locations"
-        )
-        btn_file_new.setStyleSheet(self._button_style())
-        btn_file_new.setDefault(True)
-        btn_file_new.clicked.connect(self.on_file_new_location)
-        layout.addWidget(btn_file_new)
-
-        btn_replace = QPushButton(
-            f"c) Replace {existing_parent_name} version - "
-            f"moves old to {existing_parent_name}/Superseded, files new to {dest_name}"
-        )
-        btn_replace.setStyleSheet(self._button_style())
-        btn_replace.clicked.connect(self.on_replace_existing)
-        layout.addWidget(btn_replace)
+        dest_name = dest_path.name
+        for text, slot, default in (
+            ("a) Skip - don't file anywhere", self.on_skip, False),
+            (f"b) File to {dest_name} - keep both files in different locations",
+             self.on_file_new_location, True),
+            (f"c) Replace {existing_parent_name} version - "
+             f"moves old to {existing_parent_name}/Superseded, files new to {dest_name}",
+             self.on_replace_existing, False),
+        ):
+            _add_option_button(layout, text, slot, default)
 
         self.setMinimumWidth(500)
 
-    def _button_style(self):
-        return f"""
-            QPushButton {{
-                background-color: {COLORS['bg']};
-                color: {COLORS['text']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 10px 16px;
-                text-align: left;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['primary']}11;
-                border-color: {COLORS['primary']};
-            }}
-        """
+    def _on_existing_stat(self, stat):
+        if stat is not None:
+            self.existing_label.setText(_file_details_text(self.existing_path, stat))
 
     def on_skip(self):
         self.result_action = 'skip'
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(
-            f"DUPLICATE SKIP | {self.filename} | "
-            f"Existing at: {self.existing_path}"
+        self._logger.info(
+            "DUPLICATE SKIP | %s | Existing at: %s",
+            self.filename, self.existing_path
         )
         self.accept()
 
     def on_file_new_location(self):
         self.result_action = 'proceed'
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(
-            f"DUPLICATE KEEP BOTH | {self.filename} | "
-            f"Existing: {self.existing_path}, New: {self.new_destination}"
+        self._logger.info(
+            "DUPLICATE KEEP BOTH | %s | Existing: %s, New: %s",
+            self.filename, self.existing_path, self.new_destination
         )
         self.accept()
 
     def on_replace_existing(self):
         self.result_action = 'replace'
         self.replace_target = self.existing_path
-        logger = get_file_ops_logger(self.projects_root)
-        logger.info(
-            f"DUPLICATE REPLACE DIFFERENT | {self.filename} | "
-            f"Superseding: {self.existing_path}, Filing to: {self.new_destination}"
+        self._logger.info(
+            "DUPLICATE REPLACE DIFFERENT | %s | Superseding: %s, Filing to: %s",
+            self.filename, self.existing_path, self.new_destination
         )
         self.accept()
@@ -2,6 +2,7 @@
 UI Widget components for FileUzi.
 """
 
+import functools
 import re
 import os
 
@@ -10,7 +11,7 @@ from PyQt6.QtWidgets import (
     QCheckBox, QFrame, QFileDialog, QLayout
 )
 from PyQt6.QtCore import Qt, QRect, QSize, QPoint
-from PyQt6.QtGui import QFont, QDragEnterEvent, QDropEvent
+from PyQt6.QtGui import QCursor, QFont, QDragEnterEvent, QDropEvent
 
 from fileuzi.config import (
     COLORS,
@@ -19,18 +20,161 @@ from fileuzi.config import (
     MAX_CHIP_TEXT_LENGTH,
 )
 
+# Fixed size of the round [+] add-destination button
+_ADD_CHIP_BUTTON_SIZE = QSize(20, 20)
+
+# Index of the first filing chip in AttachmentWidget.secondary_layout (after
+# the secondary checkbox)
+_CHIPS_LAYOUT_START = 1
+
+# Clickable words in a filename: runs of word characters and hyphens, two or
+# more long, trimmed to word boundaries
+_WORD_RE = re.compile(r'\b[\w\-]{2,}\b')
+
+# Stylesheets are built once from COLORS and swapped by reference, so state
+# toggles don't re-run the f-string formatting on every chip and word
+_WORD_STYLE_SELECTED = f"""
+    QLabel {{
+        background-color: {COLORS['primary']};
+        color: white;
+        padding: 1px 3px;
+        border-radius: 3px;
+        font-size: 12px;
+    }}
+"""
+_WORD_STYLE_NORMAL = f"""
+    QLabel {{
+        background-color: {COLORS['bg']};
+        color: {COLORS['text']};
+        padding: 1px 3px;
+        border-radius: 3px;
+        font-size: 12px;
+    }}
+    QLabel:hover {{
+        background-color: {COLORS['primary']}22;
+    }}
+"""
+_CHIP_STYLE_INACTIVE = """
+    QLabel {
+        background-color: #e2e8f0;
+        color: #64748b;
+        padding: 2px 8px;
+        border-radius: 10px;
+        font-size: 11px;
+    }
+    QLabel:hover {
+        background-color: #cbd5e1;
+    }
+"""
+_FILENAME_STYLE_NORMAL = f"color: {COLORS['text']}; font-size: 12px;"
+_FILENAME_STYLE_EXCLUDED = f"color: {COLORS['text_secondary']}; font-size: 12px;"
+_FILENAME_STYLE_NORMAL_BOLD = f"color: {COLORS['text']}; font-size: 12px; font-weight: bold;"
+_FILENAME_STYLE_EXCLUDED_BOLD = f"color: {COLORS['text_secondary']}; font-size: 12px; font-weight: bold;"
+# Attachment filename sheet by (is_excluded, words_visible)
+_FILENAME_STYLES = {
+    (False, False): _FILENAME_STYLE_NORMAL,
+    (False, True): _FILENAME_STYLE_NORMAL_BOLD,
+    (True, False): _FILENAME_STYLE_EXCLUDED,
+    (True, True): _FILENAME_STYLE_EXCLUDED_BOLD,
+}
+_DROPZONE_STYLE_IDLE = f"""
+    QFrame {{
+        background-color: {COLORS['bg']};
+        border: 2px dashed {COLORS['border']};
+        border-radius: 12px;
+    }}
+    QFrame:hover {{
+        border-color: {COLORS['primary']};
+        background-color: {COLORS['primary']}11;
+    }}
+"""
+# Sheet set once a drag leaves or drops; unlike the idle sheet it has no :hover rule
+_DROPZONE_STYLE_AFTER_DRAG = f"""
+    QFrame {{
+        background-color: {COLORS['bg']};
+        border: 2px dashed {COLORS['border']};
+        border-radius: 12px;
+    }}
+"""
+_DROPZONE_STYLE_HOVER = f"""
+    QFrame {{
+        background-color: {COLORS['primary']}22;
+        border: 2px dashed {COLORS['primary']};
+        border-radius: 12px;
+    }}
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def _chip_style_active(colour):
+    """Stylesheet for an active FilingChip; the colour comes from its rule."""
+    return f"""
+        QLabel {{
+            background-color: {colour};
+            color: white;
+            padding: 2px 8px;
+            border-radius: 10px;
+            font-size: 11px;
+            font-weight: bold;
+        }}
+    """
+
+# Shared pointing-hand cursor, created on first use (QCursor needs a QApplication)
+_pointing_cursor = None
+
+
+def _pointing_cursor_instance():
+    """Return the shared pointing-hand QCursor used by clickable widgets."""
+    global _pointing_cursor
+    if _pointing_cursor is None:
+        _pointing_cursor = QCursor(Qt.CursorShape.PointingHandCursor)
+    return _pointing_cursor
+
+
+def _apply_style_sheet(widget, style_sheet):
+    """Set a widget's stylesheet unless it is already the one applied.
+
+    Every setStyleSheet call makes Qt re-parse the sheet and re-polish the
+    widget, even when the text is unchanged.
+    """
+    if getattr(widget, '_last_ss', None) != style_sheet:
+        widget.setStyleSheet(style_sheet)
+        widget._last_ss = style_sheet
+
+
+@functools.lru_cache(maxsize=256)
+def _chip_display_text(full_text, max_len):
+    """
+    Return (display_text, tooltip) for a chip label.
+
+    Text longer than max_len is cut to fit with a '..' suffix and the full
+    text becomes the tooltip; otherwise tooltip is None.
+    """
+    if len(full_text) > max_len:
+        return full_text[:max_len - 2] + '..', full_text
+    return full_text, None
+
 
 class FlowLayout(QLayout):
     """A layout that arranges widgets in a flowing manner, wrapping to next line."""
 
     def __init__(self, parent=None, margin=0, spacing=-1):
+        # Size caches are set before QLayout init: installing the layout and
+        # setting its margins both call invalidate(), which clears them
+        self._hfw_cache = {}  # heightForWidth by width; Qt repeats the same widths
+        self._min_size = None  # cached minimumSize()
         super().__init__(parent)
         self.setContentsMargins(margin, margin, margin, margin)
         self._spacing = spacing
         self._items = []
 
+    def _clear_size_caches(self):
+        self._hfw_cache.clear()
+        self._min_size = None
+
     def addItem(self, item):
         self._items.append(item)
+        self._clear_size_caches()
 
     def spacing(self):
         return self._spacing if self._spacing >= 0 else super().spacing()
@@ -45,9 +189,15 @@ class FlowLayout(QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self._items):
+            self._clear_size_caches()
             return self._items.pop(index)
         return None
 
+    def invalidate(self):
+        # Called by Qt when a child's size hint changes
+        self._clear_size_caches()
+        super().invalidate()
+
     def expandingDirections(self):
         return Qt.Orientation(0)
 
@@ -55,7 +205,10 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        return self._do_layout(QRect(0, 0, width, 0), True)
+        height = self._hfw_cache.get(width)
+        if height is None:
+            height = self._hfw_cache[width] = self._do_layout(QRect(0, 0, width, 0), True)
+        return height
 
     def setGeometry(self, rect):
         super().setGeometry(rect)
@@ -65,12 +218,15 @@ class FlowLayout(QLayout):
         return self.minimumSize()
 
     def minimumSize(self):
-        size = QSize()
-        for item in self._items:
-            size = size.expandedTo(item.minimumSize())
-        margins = self.contentsMargins()
-        size += QSize(margins.left() + margins.right(), margins.top() + margins.bottom())
-        return size
+        if self._min_size is None:
+            size = QSize()
+            for item in self._items:
+                size = size.expandedTo(item.minimumSize())
+            margins = self.contentsMargins()
+            size += QSize(margins.left() + margins.right(), margins.top() + margins.bottom())
+            self._min_size = size
+        # Copy, as QSize is mutable from Python
+        return QSize(self._min_size)
 
     def _do_layout(self, rect, test_only):
         x = rect.x()
@@ -79,19 +235,21 @@ class FlowLayout(QLayout):
         spacing = self.spacing()
 
         for item in self._items:
-            widget = item.widget()
+            # One sizeHint() call per item; each is a round trip into Qt
+            size_hint = item.sizeHint()
+            item_width = size_hint.width()
             space_x = spacing
             space_y = spacing
-            next_x = x + item.sizeHint().width() + space_x
+            next_x = x + item_width + space_x
             if next_x - space_x > rect.right() and line_height > 0:
                 x = rect.x()
                 y = y + line_height + space_y
-                next_x = x + item.sizeHint().width() + space_x
+                next_x = x + item_width + space_x
                 line_height = 0
             if not test_only:
-                item.setGeometry(QRect(QPoint(x, y), item.sizeHint()))
+                item.setGeometry(QRect(QPoint(x, y), size_hint))
             x = next_x
-            line_height = max(line_height, item.sizeHint().height())
+            line_height = max(line_height, size_hint.height())
         return y + line_height - rect.y()
 
 
@@ -105,34 +263,13 @@ class ClickableWordLabel(QLabel):
         self.index = index
         self.word_group = word_group  # 'subject' or 'filename_X' to identify source
         self.selected = False
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._last_ss = None
+        self.setCursor(_pointing_cursor_instance())
         self.setMouseTracking(True)
         self.update_style()
 
     def update_style(self):
-        if self.selected:
-            self.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {COLORS['primary']};
-                    color: white;
-                    padding: 1px 3px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {COLORS['bg']};
-                    color: {COLORS['text']};
-                    padding: 1px 3px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                }}
-                QLabel:hover {{
-                    background-color: {COLORS['primary']}22;
-                }}
-            """)
+        _apply_style_sheet(self, _WORD_STYLE_SELECTED if self.selected else _WORD_STYLE_NORMAL)
 
     def set_selected(self, selected):
         """Set selection state and update style."""
@@ -166,57 +303,36 @@ class FilingChip(QLabel):
 
     def __init__(self, rule, parent_widget, active=False, max_text_length=None):
         # Truncate text if longer than max length
-        max_len = max_text_length or MAX_CHIP_TEXT_LENGTH
-        full_text = rule['folder_type']
-        if len(full_text) > max_len:
-            display_text = full_text[:max_len - 2] + '..'
-        else:
-            display_text = full_text
+        display_text, tooltip = _chip_display_text(
+            rule['folder_type'], max_text_length or MAX_CHIP_TEXT_LENGTH
+        )
 
         super().__init__(display_text)
         self.rule = rule
         self.parent_widget = parent_widget
         self.active = active
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._last_ss = None
+        self.setCursor(_pointing_cursor_instance())
 
         # Show full text on hover if truncated
-        if len(full_text) > max_len:
-            self.setToolTip(full_text)
+        if tooltip:
+            self.setToolTip(tooltip)
 
         self.update_style()
 
     def update_style(self):
         """Update chip appearance based on active state."""
-        colour = self.rule['colour']
         if self.active:
             # Active: colored background
-            self.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {colour};
-                    color: white;
-                    padding: 2px 8px;
-                    border-radius: 10px;
-                    font-size: 11px;
-                    font-weight: bold;
-                }}
-            """)
+            _apply_style_sheet(self, _chip_style_active(self.rule['colour']))
         else:
             # Inactive: gray background
-            self.setStyleSheet(f"""
-                QLabel {{
-                    background-color: #e2e8f0;
-                    color: #64748b;
-                    padding: 2px 8px;
-                    border-radius: 10px;
-                    font-size: 11px;
-                }}
-                QLabel:hover {{
-                    background-color: #cbd5e1;
-                }}
-            """)
+            _apply_style_sheet(self, _CHIP_STYLE_INACTIVE)
 
     def set_active(self, active):
         """Set the active state of the chip."""
+        if self.active == active:
+            return
         self.active = active
         self.update_style()
 
@@ -240,6 +356,7 @@ class AttachmentWidget(QWidget):
         self.is_excluded = is_excluded
         self.words_visible = False
         self.word_labels = []
+        self._words_populated = False  # word labels are built on first expand
 
         # Secondary filing
         self.matched_rules = matched_rules or []
@@ -253,6 +370,9 @@ class AttachmentWidget(QWidget):
         self.setup_ui()
 
     def setup_ui(self):
+        # Hold repaints until every child is added so the build settles in one pass
+        self.setUpdatesEnabled(False)
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(2)
@@ -270,12 +390,9 @@ class AttachmentWidget(QWidget):
 
         # Filename label (clickable to show/hide words) - allow word wrap for long names
         self.filename_label = QLabel(f"{self.filename} ({self.size_str})")
-        self.filename_label.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.filename_label.setCursor(_pointing_cursor_instance())
         self.filename_label.setWordWrap(True)
-        if self.is_excluded:
-            self.filename_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px;")
-        else:
-            self.filename_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
+        _apply_style_sheet(self.filename_label, _FILENAME_STYLES[(self.is_excluded, self.words_visible)])
         self.filename_label.mousePressEvent = self.on_filename_clicked
         main_row.addWidget(self.filename_label, 1)  # stretch factor 1 to take available space
 
@@ -291,8 +408,7 @@ class AttachmentWidget(QWidget):
         self.words_container.setVisible(False)
         layout.addWidget(self.words_container)
 
-        # Populate words from filename
-        self._populate_words()
+        self.setUpdatesEnabled(True)
 
     def _setup_secondary_filing_inline(self, row_layout):
         """Setup the secondary filing checkbox and chips inline at end of row.
@@ -303,9 +419,12 @@ class AttachmentWidget(QWidget):
         # Fixed-width container for entire secondary filing section (aligns with buttons)
         self.secondary_container = QWidget()
         self.secondary_container.setFixedWidth(SECONDARY_FILING_WIDTH)
-        secondary_layout = QHBoxLayout(self.secondary_container)
+        self.secondary_container.setFixedHeight(24)
+        # Holds the checkbox, then the chips (from _CHIPS_LAYOUT_START), then [+]
+        self.secondary_layout = secondary_layout = QHBoxLayout(self.secondary_container)
         secondary_layout.setContentsMargins(0, 0, 0, 0)
         secondary_layout.setSpacing(4)
+        self.secondary_container.setUpdatesEnabled(False)
 
         # Secondary filing checkbox (no text - header has the label)
         self.secondary_checkbox = QCheckBox()
@@ -314,13 +433,6 @@ class AttachmentWidget(QWidget):
         self.secondary_checkbox.stateChanged.connect(self._on_secondary_checkbox_changed)
         secondary_layout.addWidget(self.secondary_checkbox)
 
-        # Chips container - horizontal, limited to MAX_CHIPS
-        self.chips_container = QWidget()
-        self.chips_container.setFixedHeight(24)
-        self.chips_layout = QHBoxLayout(self.chips_container)
-        self.chips_layout.setContentsMargins(0, 0, 0, 0)
-        self.chips_layout.setSpacing(4)
-
         # Build list of chips to show (limited to MAX_CHIPS)
         # Priority: drawings first (auto-detected), then by confidence descending
         chips_to_add = []
@@ -342,18 +454,16 @@ class AttachmentWidget(QWidget):
             if len(chips_to_add) < MAX_CHIPS:
                 chips_to_add.append(match['rule'])
 
-        # Create chip widgets (up to MAX_CHIPS)
+        # Create chip widgets (up to MAX_CHIPS), laid out directly in the row
         for rule in chips_to_add[:MAX_CHIPS]:
             chip = FilingChip(rule, self, active=self.secondary_filing_enabled)
-            self.chips_layout.addWidget(chip)
+            secondary_layout.addWidget(chip)
             self.filing_chips.append(chip)
 
-        secondary_layout.addWidget(self.chips_container)
-
         # Add [+] button for adding more destinations (right after chips)
         self.add_chip_btn = QPushButton("+")
-        self.add_chip_btn.setFixedSize(20, 20)
-        self.add_chip_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.add_chip_btn.setFixedSize(_ADD_CHIP_BUTTON_SIZE)
+        self.add_chip_btn.setCursor(_pointing_cursor_instance())
         self.add_chip_btn.setStyleSheet(f"""
             QPushButton {{
                 background-color: {COLORS['bg']};
@@ -373,6 +483,7 @@ class AttachmentWidget(QWidget):
         self.add_chip_btn.setVisible(self.secondary_filing_enabled)
         secondary_layout.addWidget(self.add_chip_btn)
         secondary_layout.addStretch()  # Push chips and + to the left
+        self.secondary_container.setUpdatesEnabled(True)
 
         row_layout.addWidget(self.secondary_container)
 
@@ -400,7 +511,7 @@ class AttachmentWidget(QWidget):
         """Remove a filing chip."""
         if chip in self.filing_chips:
             self.filing_chips.remove(chip)
-            self.chips_layout.removeWidget(chip)
+            self.secondary_layout.removeWidget(chip)
             chip.deleteLater()
             # Show + button if now under limit
             if hasattr(self, 'add_chip_btn'):
@@ -425,20 +536,20 @@ class AttachmentWidget(QWidget):
         if len(self.filing_chips) >= MAX_CHIPS and is_manual:
             # Remove the last chip (lowest priority)
             last_chip = self.filing_chips.pop()
-            self.chips_layout.removeWidget(last_chip)
+            self.secondary_layout.removeWidget(last_chip)
             last_chip.deleteLater()
 
         # Only add if under limit
         if len(self.filing_chips) < MAX_CHIPS:
             chip = FilingChip(rule_copy, self, active=self.secondary_filing_enabled)
-            if hasattr(self, 'chips_layout'):
+            if hasattr(self, 'secondary_layout'):
                 if is_manual:
                     # Insert at front for manual additions
-                    self.chips_layout.insertWidget(0, chip)
+                    self.secondary_layout.insertWidget(_CHIPS_LAYOUT_START, chip)
                     self.filing_chips.insert(0, chip)
                 else:
-                    # Append at end for auto additions
-                    self.chips_layout.addWidget(chip)
+                    # Append at end for auto additions (before the [+] button)
+                    self.secondary_layout.insertWidget(_CHIPS_LAYOUT_START + len(self.filing_chips), chip)
                     self.filing_chips.append(chip)
 
         # Hide + button if at max chips
@@ -454,36 +565,33 @@ class AttachmentWidget(QWidget):
         """Get list of active secondary filing destinations."""
         if not self.secondary_filing_enabled:
             return []
-        return [chip.rule for chip in self.filing_chips if chip.active]
+        # Every chip's active state follows secondary_filing_enabled (set on
+        # creation and by _on_secondary_checkbox_changed), so all are active here
+        return [chip.rule for chip in self.filing_chips]
 
     def _populate_words(self):
         """Extract and create word labels from filename."""
-        # Remove extension and split into words
-        name_without_ext = self.filename.rsplit('.', 1)[0] if '.' in self.filename else self.filename
-        words = re.findall(r'\b[\w\-]+\b', name_without_ext)
+        # Remove extension and split into words (single characters never match)
+        name_without_ext = os.path.splitext(self.filename)[0]
+        words = _WORD_RE.findall(name_without_ext)
 
+        self.words_container.setUpdatesEnabled(False)
         for i, word in enumerate(words):
-            if len(word) > 1:  # Skip single characters
-                label = ClickableWordLabel(word, self.parent_widget, i, word_group=f'filename_{id(self)}')
-                self.words_layout.addWidget(label)
-                self.word_labels.append(label)
+            label = ClickableWordLabel(word, self.parent_widget, i, word_group=f'filename_{id(self)}')
+            self.words_layout.addWidget(label)
+            self.word_labels.append(label)
+        self.words_container.setUpdatesEnabled(True)
 
     def on_filename_clicked(self, event):
         """Toggle visibility of clickable words."""
         self.words_visible = not self.words_visible
+        if self.words_visible and not self._words_populated:
+            self._populate_words()
+            self._words_populated = True
         self.words_container.setVisible(self.words_visible)
 
-        # Update filename style to indicate expanded state
-        if self.words_visible:
-            if self.is_excluded:
-                self.filename_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px; font-weight: bold;")
-            else:
-                self.filename_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px; font-weight: bold;")
-        else:
-            if self.is_excluded:
-                self.filename_label.setStyleSheet(f"color: {COLORS['text_secondary']}; font-size: 12px;")
-            else:
-                self.filename_label.setStyleSheet(f"color: {COLORS['text']}; font-size: 12px;")
+        # Update filename style to indicate expanded state (bold when expanded)
+        _apply_style_sheet(self.filename_label, _FILENAME_STYLES[(self.is_excluded, self.words_visible)])
 
     def isChecked(self):
         """Return checkbox state."""
@@ -505,17 +613,7 @@ class DropZone(QFrame):
 
     def setup_ui(self):
         self.setMinimumHeight(200)
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['bg']};
-                border: 2px dashed {COLORS['border']};
-                border-radius: 12px;
-            }}
-            QFrame:hover {{
-                border-color: {COLORS['primary']};
-                background-color: {COLORS['primary']}11;
-            }}
-        """)
+        self.setStyleSheet(_DROPZONE_STYLE_IDLE)
 
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -539,31 +637,13 @@ class DropZone(QFrame):
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
-            self.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {COLORS['primary']}22;
-                    border: 2px dashed {COLORS['primary']};
-                    border-radius: 12px;
-                }}
-            """)
+            self.setStyleSheet(_DROPZONE_STYLE_HOVER)
 
     def dragLeaveEvent(self, event):
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['bg']};
-                border: 2px dashed {COLORS['border']};
-                border-radius: 12px;
-            }}
-        """)
+        self.setStyleSheet(_DROPZONE_STYLE_AFTER_DRAG)
 
     def dropEvent(self, event: QDropEvent):
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLORS['bg']};
-                border: 2px dashed {COLORS['border']};
-                border-radius: 12px;
-            }}
-        """)
+        self.setStyleSheet(_DROPZONE_STYLE_AFTER_DRAG)
 
         files = []
         for url in event.mimeData().urls():
@@ -10,7 +10,7 @@ from .path_utils import (
     get_file_ops_logger,
 )
 from .file_operations import safe_copy, safe_move, safe_write_attachment
-from .text_utils import HTMLTextExtractor
+from .text_utils import HTMLTextExtractor, html_to_text
 
 __all__ = [
     'PathJailViolation',
@@ -26,4 +26,5 @@ __all__ = [
     'safe_move',
     'safe_write_attachment',
     'HTMLTextExtractor',
+    'html_to_text',
 ]
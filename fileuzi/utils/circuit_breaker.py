@@ -2,7 +2,8 @@
 Circuit breaker for preventing runaway file operations.
 """
 
-from pathlib import Path
+import os
+import threading
 
 from .exceptions import CircuitBreakerTripped
 
@@ -11,12 +12,20 @@ class FileOperationCounter:
     """
     Counts file operations per destination during a single filing action.
     Trips the circuit breaker if any destination exceeds its expected file count.
+
+    Args:
+        record_history: Keep every recorded operation for get_summary() and the
+                        trip message. Pass False for large batches where only
+                        the per-destination counts are wanted; the global
+                        instance has it off unless FILEUZI_OP_LOG=1 is set.
     """
 
-    def __init__(self):
+    def __init__(self, record_history=True):
+        self.record_history = record_history
         self.operations = []
         self.destination_limits = {}  # folder_path -> expected file count
         self.destination_counts = {}  # folder_path -> actual file count
+        self._lock = threading.Lock()  # record() may be called from writer threads
 
     def reset(self, destination_limits=None):
         """
@@ -42,38 +51,56 @@ class FileOperationCounter:
         Raises:
             CircuitBreakerTripped: If any destination exceeds its expected count
         """
-        self.operations.append((operation_type, str(source), str(destination)))
+        # Stored as given; paths are only formatted if the breaker trips
+        if self.record_history:
+            self.operations.append((operation_type, source, destination))
 
         # Only count WRITE and COPY operations toward destination limits
         if operation_type in ('WRITE', 'COPY'):
-            dest_path = Path(destination)
-            dest_folder = str(dest_path.parent)
+            # Destinations are Paths or str(Path), already normalised, so the
+            # string dirname matches str(Path.parent) without building a Path
+            dest_folder = os.path.dirname(os.fspath(destination))
 
             # Increment count for this destination folder
-            self.destination_counts[dest_folder] = self.destination_counts.get(dest_folder, 0) + 1
-            actual_count = self.destination_counts[dest_folder]
+            with self._lock:
+                actual_count = self.destination_counts.get(dest_folder, 0) + 1
+                self.destination_counts[dest_folder] = actual_count
 
             # Check if this destination has a limit set
-            if dest_folder in self.destination_limits:
+            expected = self.destination_limits.get(dest_folder)
+            if expected is not None:
                 # Allow small overhead (2) for edge cases like renamed duplicates
-                limit = self.destination_limits[dest_folder] + 2
+                limit = expected + 2
                 if actual_count > limit:
-                    ops_summary = "\n".join([f"  {i+1}. {op[0]}: {op[1]} -> {op[2]}"
-                                             for i, op in enumerate(self.operations)])
-                    raise CircuitBreakerTripped(
+                    message = (
                         f"STOPPED: Too many files written to one destination.\n"
                         f"Folder: {dest_folder}\n"
-                        f"Expected: {self.destination_limits[dest_folder]}, Actual: {actual_count}\n\n"
-                        f"Operations attempted:\n{ops_summary}"
+                        f"Expected: {expected}, Actual: {actual_count}"
                     )
+                    if self.record_history:
+                        ops_summary = "\n".join([f"  {i+1}. {op[0]}: {op[1]} -> {op[2]}"
+                                                 for i, op in enumerate(self.operations)])
+                        message += f"\n\nOperations attempted:\n{ops_summary}"
+                    raise CircuitBreakerTripped(message)
 
     def get_summary(self):
-        """Get a summary of all operations recorded."""
+        """
+        Get a summary of all operations recorded.
+
+        Returns:
+            list: (operation_type, source, destination) tuples, with source and
+                  destination as passed to record() (str or Path). Empty when
+                  record_history is off.
+        """
         return self.operations.copy()
 
 
-# Global circuit breaker instance - reset at start of each filing action
-_circuit_breaker = FileOperationCounter()
+# Global circuit breaker instance - reset at start of each filing action.
+# It keeps no operation history (the per-operation log is pure overhead on
+# large batches) unless FILEUZI_OP_LOG=1 is set for a forensic trail.
+_circuit_breaker = FileOperationCounter(
+    record_history=os.environ.get('FILEUZI_OP_LOG') == '1'
+)
 
 
 def get_circuit_breaker():
@@ -61,7 +61,13 @@ _file_ops_logger = None
 
 
 def get_file_ops_logger(projects_root):
-    """Get or create the file operations logger."""
+    """
+    Get or create the file operations logger.
+
+    The logger is created once per process (the first projects_root wins);
+    later calls return it after a single global check, so callers can fetch
+    it per operation rather than caching it themselves.
+    """
     global _file_ops_logger
     if _file_ops_logger is None:
         log_path = get_operations_log_path(projects_root)
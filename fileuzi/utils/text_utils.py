@@ -2,18 +2,126 @@
 Text parsing and extraction utilities for FileUzi.
 """
 
+import re
 from html.parser import HTMLParser
 
+# Optional C-backed HTML parsers - much faster than html.parser on large emails
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Elements whose text is never part of the readable message (Outlook puts
+# its CSS in <style> and the subject in <title>). The rest of <head> holds no
+# text; parsers differ on where they put stray tags, so <head> isn't skipped
+_NON_CONTENT_TAGS = ('title', 'script', 'style')
+
+# The parsers disagree on whitespace-only text nodes, so whitespace runs are
+# normalised: a run with a blank line becomes a paragraph break ('\n\n'), one
+# with a single line break a newline, any other one space
+_NEWLINE_RUN_RE = re.compile(r'\s*\n\s*')
+_SPACE_RUN_RE = re.compile(r'[^\S\n]+')
+
+
+def _collapse_newline_run(match):
+    return '\n\n' if match.group().count('\n') > 1 else '\n'
+
 
 class HTMLTextExtractor(HTMLParser):
-    """Simple HTML parser to extract plain text from HTML content."""
+    """Simple HTML parser to extract plain text from HTML content.
+
+    Text inside <title>, <script> and <style> is skipped.
+    """
 
     def __init__(self):
         super().__init__()
         self.text_parts = []
+        self._skip_depth = 0  # open <title>/<script>/<style> elements
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _NON_CONTENT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _NON_CONTENT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
 
     def handle_data(self, data):
-        self.text_parts.append(data)
+        if not self._skip_depth:
+            self.text_parts.append(data)
 
     def get_text(self):
         return ' '.join(self.text_parts)
+
+
+def _text_selectolax(html_content):
+    """Text nodes outside non-content elements, via selectolax (lexbor)."""
+    tree = LexborHTMLParser(html_content)
+    tree.strip_tags(list(_NON_CONTENT_TAGS))
+    if tree.root is None:
+        return ''
+    return ' '.join(node.text_content for node in tree.root.traverse(include_text=True)
+                    if node.tag == '-text')
+
+
+def _text_lxml(html_content):
+    """Text nodes outside non-content elements and comments, via lxml."""
+    doc = lxml.html.fromstring(html_content)
+    parts = []
+
+    def collect(element):
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            # Comments and processing instructions have non-string tags
+            if isinstance(child.tag, str) and child.tag not in _NON_CONTENT_TAGS:
+                collect(child)
+            # The tail follows the child, so it counts even when the child is skipped
+            if child.tail:
+                parts.append(child.tail)
+
+    # A comment-only document parses to the comment itself
+    if isinstance(doc.tag, str) and doc.tag not in _NON_CONTENT_TAGS:
+        collect(doc)
+    return ' '.join(parts)
+
+
+def html_to_text(html_content):
+    """
+    Extract plain text from HTML content.
+
+    Uses selectolax or lxml when installed, falling back to HTMLTextExtractor;
+    all three return the same text for well-formed HTML. Content of <title>,
+    <script> and <style> and comments is dropped.
+
+    Returns:
+        str: The text content, with text nodes separated by spaces, whitespace
+             runs containing a blank line collapsed to '\n\n', other runs
+             containing a line break to '\n' and the rest to one space
+    """
+    if not html_content:
+        return ''
+
+    text = None
+    if HAS_SELECTOLAX:
+        text = _text_selectolax(html_content)
+    elif HAS_LXML:
+        try:
+            text = _text_lxml(html_content)
+        except Exception:
+            pass  # Fall through to the pure-Python parser
+
+    if text is None:
+        extractor = HTMLTextExtractor()
+        extractor.feed(html_content)
+        extractor.close()
+        text = extractor.get_text()
+
+    return _SPACE_RUN_RE.sub(' ', _NEWLINE_RUN_RE.sub(_collapse_newline_run, text)).strip()
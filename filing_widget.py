@@ -114,6 +114,7 @@ from fileuzi.ui import (
     DuplicateEmailDialog,
     FileDuplicateDialog,
     DifferentLocationDuplicateDialog,
+    register_dialog_styles,
 )
 
 from fileuzi.services.filing_operations import replace_with_supersede
@@ -206,9 +207,8 @@ class FilingWidget(QMainWindow):
                 # Copy the imported database
                 safe_copy(dialog.imported_db_path, self.db_path, self.projects_root)
             elif dialog.result_action == 'copy':
-                # Copy from previous root
-                old_db = get_database_path(self.previous_projects_root)
-                safe_copy(old_db, self.db_path, self.projects_root)
+                # Copy from previous root (the dialog already resolved its path)
+                safe_copy(dialog.old_db_path, self.db_path, self.projects_root)
         else:
             # Database exists - verify schema
             if not verify_database_schema(self.db_path):
@@ -2918,6 +2918,9 @@ def main():
     font = QFont("Segoe UI", 10)
     app.setFont(font)
 
+    # Dialog stylesheet is parsed once for the whole app, not per dialog
+    register_dialog_styles(app)
+
     window = FilingWidget()
     window.show()
 
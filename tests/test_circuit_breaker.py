@@ -5,6 +5,10 @@ The FileOperationCounter tracks operations per destination folder and trips
 when any single destination exceeds its expected file count.
 """
 
+import os
+import subprocess
+import sys
+
 import pytest
 from pathlib import Path
 
@@ -125,6 +129,20 @@ class TestDestinationLimits:
         # Only 1 counted
         assert counter.destination_counts.get(dest_folder, 0) == 1
 
+    def test_path_destinations_match_string_limits(self, tmp_path):
+        """Test Path destinations count against limits keyed by str(folder)."""
+        dest_folder = tmp_path / "dest"
+        counter = FileOperationCounter()
+        counter.reset({str(dest_folder): 1})
+
+        counter.record("COPY", "/src/a.pdf", dest_folder / "a.pdf")
+        counter.record("WRITE", "memory", dest_folder / "b.pdf")
+        counter.record("COPY", "/src/c.pdf", str(dest_folder / "c.pdf"))
+
+        assert counter.destination_counts[str(dest_folder)] == 3
+        with pytest.raises(CircuitBreakerTripped):
+            counter.record("COPY", "/src/d.pdf", dest_folder / "d.pdf")
+
     def test_no_trip_when_no_limit_set(self, tmp_path):
         """Test operations without set limits don't trip."""
         counter = FileOperationCounter()
@@ -278,3 +296,64 @@ class TestExceptionContent:
             error_msg = str(e)
             # Should have operation details
             assert len(error_msg) > 0
+
+
+# ============================================================================
+# History Recording Tests
+# ============================================================================
+
+class TestHistoryRecording:
+    """Tests for the record_history switch."""
+
+    def test_history_recorded_by_default(self, tmp_path):
+        """Test operations are kept unless history is switched off."""
+        counter = FileOperationCounter()
+
+        counter.record("COPY", "/src/a.pdf", f"{tmp_path}/a.pdf")
+
+        assert counter.record_history is True
+        assert len(counter.get_summary()) == 1
+
+    def test_history_off_still_counts_and_trips(self, tmp_path):
+        """Test limits are enforced without keeping the operation history."""
+        dest_folder = str(tmp_path / "dest")
+        counter = FileOperationCounter(record_history=False)
+        counter.reset({dest_folder: 0})
+
+        counter.record("COPY", "/src/a.pdf", f"{dest_folder}/a.pdf")
+        counter.record("COPY", "/src/b.pdf", f"{dest_folder}/b.pdf")
+
+        assert counter.get_summary() == []
+        assert counter.destination_counts[dest_folder] == 2
+
+        with pytest.raises(CircuitBreakerTripped) as exc_info:
+            counter.record("COPY", "/src/c.pdf", f"{dest_folder}/c.pdf")
+
+        message = str(exc_info.value)
+        assert dest_folder in message
+        assert "Expected: 0, Actual: 3" in message
+        assert "Operations attempted" not in message
+
+    def _global_breaker_summary(self, op_log):
+        """Record one COPY through a fresh process's global breaker; return its summary."""
+        env = {k: v for k, v in os.environ.items() if k != 'FILEUZI_OP_LOG'}
+        if op_log is not None:
+            env['FILEUZI_OP_LOG'] = op_log
+        code = (
+            "from fileuzi.utils.circuit_breaker import get_circuit_breaker\n"
+            "cb = get_circuit_breaker()\n"
+            "cb.reset({'/dest': 1})\n"
+            "cb.record('COPY', '/src/a.pdf', '/dest/a.pdf')\n"
+            "print(cb.destination_counts['/dest'], len(cb.get_summary()))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], env=env,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.split()
+
+    def test_global_breaker_skips_history_by_default(self):
+        """Test the global instance only counts unless FILEUZI_OP_LOG is set."""
+        assert self._global_breaker_summary(None) == ['1', '0']
+
+    def test_global_breaker_history_env_flag(self):
+        """Test FILEUZI_OP_LOG=1 turns history on for the global instance."""
+        assert self._global_breaker_summary('1') == ['1', '1']
@@ -11,8 +11,41 @@ from fileuzi.services.email_parser import (
     detect_email_direction,
     extract_embedded_images,
     parse_eml_file,
+    eml_has_attachments_fast,
 )
 from fileuzi.database.email_records import generate_email_hash
+from fileuzi.utils import text_utils
+from fileuzi.utils.text_utils import html_to_text
+
+
+# Outlook-style HTML body: conditional comments, CSS in <head>, Office tags
+OUTLOOK_HTML = """<html xmlns:o="urn:schemas-microsoft-com:office:office">
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+<title>RE: 2506 Drawings</title>
+<!--[if gte mso 9]><xml><o:OfficeDocumentSettings><o:AllowPNG/>
+</o:OfficeDocumentSettings></xml><![endif]-->
+<style><!-- p.MsoNormal {margin:0cm; font-family:"Calibri",sans-serif;} --></style>
+<script>var tracking = 1;</script>
+</head>
+<body lang="EN-GB">
+<div class="WordSection1">
+<p class="MsoNormal">Hi John,<o:p></o:p></p>
+<p class="MsoNormal"><o:p>&nbsp;</o:p></p>
+<p class="MsoNormal">Please see the revised drawings for <b>2506</b> attached &amp; let me know.<o:p></o:p></p>
+<p class="MsoNormal">Kind regards,<br>
+Jake White<o:p></o:p></p>
+</div>
+</body>
+</html>
+"""
+
+OUTLOOK_TEXT = (
+    'Hi John,\n\n'
+    'Please see the revised drawings for 2506 attached & let me know.\n'
+    'Kind regards,\n'
+    'Jake White'
+)
 
 
 # ============================================================================
@@ -281,6 +314,69 @@ class TestAttachmentExtraction:
         assert len(large_images) >= 1
 
 
+    def test_fast_scan_detects_attachment(self, sample_eml_inbound):
+        """Test the raw header scan finds a regular attachment."""
+        assert eml_has_attachments_fast(sample_eml_inbound) is True
+
+    def test_fast_scan_no_attachment(self, tmp_path):
+        """Test the raw header scan reports plain emails as attachment-free."""
+        eml_path = tmp_path / "plain.eml"
+        eml_path.write_text(
+            "From: bob@example.com\nTo: jw@jakewhitearchitecture.com\n"
+            "Subject: Hello\n\nJust a note, no attachment here.\n"
+        )
+
+        assert eml_has_attachments_fast(eml_path) is False
+        assert parse_eml_file(eml_path)['attachments'] == []
+
+    def test_fast_scan_folded_disposition_header(self, tmp_path):
+        """Test a Content-Disposition value on a folded line is still found."""
+        eml_path = tmp_path / "folded.eml"
+        eml_path.write_bytes(
+            b'From: bob@example.com\r\nSubject: Plans\r\n'
+            b'Content-Type: multipart/mixed; boundary="XX"\r\n\r\n'
+            b'--XX\r\nContent-Type: text/plain\r\n\r\nSee attached.\r\n'
+            b'--XX\r\nContent-Type: application/pdf\r\n'
+            b'Content-Disposition:\r\n attachment; filename=a.pdf\r\n'
+            b'Content-Transfer-Encoding: base64\r\n\r\nJVBERg==\r\n--XX--\r\n'
+        )
+
+        assert len(parse_eml_file(eml_path)['attachments']) == 1
+        assert eml_has_attachments_fast(eml_path) is True
+
+    def test_fast_scan_inline_parts(self, tmp_path):
+        """Test named inline parts count, but embedded inline images do not."""
+        def write_eml(name, part_headers):
+            eml_path = tmp_path / name
+            eml_path.write_text(
+                'From: bob@example.com\nSubject: Photos\n'
+                'Content-Type: multipart/related; boundary="XX"\n\n'
+                '--XX\nContent-Type: text/html\n\n<img src="cid:img1">\n'
+                f'--XX\n{part_headers}\nContent-Transfer-Encoding: base64\n\nQUJD\n--XX--\n'
+            )
+            return eml_path
+
+        named_inline = write_eml(
+            "inline.eml", 'Content-Type: application/pdf\nContent-Disposition: inline; filename="a.pdf"'
+        )
+        embedded = write_eml(
+            "embedded.eml",
+            'Content-Type: image/png\nContent-Disposition: inline; filename="a.png"\nContent-ID: <img1>'
+        )
+
+        assert len(parse_eml_file(named_inline)['attachments']) == 1
+        assert eml_has_attachments_fast(named_inline) is True
+        assert parse_eml_file(embedded)['attachments'] == []
+        assert eml_has_attachments_fast(embedded) is False
+
+    def test_fast_scan_empty_file(self, tmp_path):
+        """Test the raw header scan handles empty files."""
+        eml_path = tmp_path / "empty.eml"
+        eml_path.write_bytes(b'')
+
+        assert eml_has_attachments_fast(eml_path) is False
+
+
 # ============================================================================
 # Full Email Parsing Tests
 # ============================================================================
@@ -318,3 +414,67 @@ class TestFullEmailParsing:
         email_data = parse_eml_file(sample_eml_inbound)
 
         assert 'date' in email_data or 'date_iso' in email_data
+
+    def test_parse_html_only_email(self, sample_eml_embedded_images):
+        """Test HTML-only emails yield both stripped text and raw HTML bodies."""
+        email_data = parse_eml_file(sample_eml_embedded_images)
+
+        assert 'beam detail query' in email_data['body'].lower()
+        assert '<p>' not in email_data['body']
+        assert 'cid:' in email_data['html_body']
+
+    def test_parse_plain_email_has_no_html_body(self, sample_eml_inbound):
+        """Test plain-text emails report no HTML body."""
+        email_data = parse_eml_file(sample_eml_inbound)
+
+        assert email_data['html_body'] is None
+
+
+# ============================================================================
+# HTML Text Extraction Tests
+# ============================================================================
+
+class TestHtmlToText:
+    """Tests for html_to_text and its parser backends."""
+
+    @patch.object(text_utils, 'HAS_LXML', False)
+    @patch.object(text_utils, 'HAS_SELECTOLAX', False)
+    def test_pure_python_outlook_email(self):
+        """Test the html.parser fallback drops title, style, script and comments."""
+        assert html_to_text(OUTLOOK_HTML) == OUTLOOK_TEXT
+
+    @patch.object(text_utils, 'HAS_LXML', False)
+    @patch.object(text_utils, 'HAS_SELECTOLAX', False)
+    def test_blank_lines_kept_as_paragraph_breaks(self):
+        """Test whitespace runs collapse to at most one blank line."""
+        html = '<p>One</p>\n\n\n<p>Two</p>\n<p>Three  four</p>'
+
+        assert html_to_text(html) == 'One\n\nTwo\nThree four'
+
+    @patch.object(text_utils, 'HAS_LXML', False)
+    @patch.object(text_utils, 'HAS_SELECTOLAX', False)
+    def test_title_script_style_dropped(self):
+        """Test title, script and style text no longer reach the body text."""
+        html = ('<html><head><title>RE: 2506</title><style>p {margin:0}</style></head>'
+                '<body><script>track()</script><p>Hello</p></body></html>')
+
+        assert html_to_text(html) == 'Hello'
+
+    def test_empty_html(self):
+        """Test empty input yields empty text."""
+        assert html_to_text('') == ''
+        assert html_to_text(None) == ''
+
+    @patch.object(text_utils, 'HAS_LXML', False)
+    def test_selectolax_matches_pure_python(self):
+        """Test the selectolax backend extracts the same text."""
+        pytest.importorskip('selectolax.lexbor')
+        with patch.object(text_utils, 'HAS_SELECTOLAX', True):
+            assert html_to_text(OUTLOOK_HTML) == OUTLOOK_TEXT
+
+    @patch.object(text_utils, 'HAS_SELECTOLAX', False)
+    def test_lxml_matches_pure_python(self):
+        """Test the lxml backend extracts the same text."""
+        pytest.importorskip('lxml.html')
+        with patch.object(text_utils, 'HAS_LXML', True):
+            assert html_to_text(OUTLOOK_HTML) == OUTLOOK_TEXT
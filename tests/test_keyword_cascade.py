@@ -2,6 +2,9 @@
 Keyword Matching / Cascade Unit Tests for FileUzi.
 """
 
+import subprocess
+import sys
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -11,6 +14,7 @@ from fileuzi.services.filing_rules import (
     match_filing_rules_cascade,
 )
 from fileuzi.services.drawing_manager import is_drawing_pdf
+from fileuzi.services.pdf_generator import is_junk_pdf_line
 
 
 # ============================================================================
@@ -171,6 +175,24 @@ class TestPdfMetadataFallback:
 
             # Metadata step should be skipped when title matches filename
 
+    def test_pdf_text_extracted_once_per_attachment(self, project_root, filing_rules_csv):
+        """Test repeat cascades over the same PDF bytes reuse the extracted text."""
+        rules = load_filing_rules(project_root)
+
+        with patch('fileuzi.services.filing_rules.extract_pdf_metadata_title') as mock_meta:
+            mock_meta.return_value = "Structural Calculations"
+
+            for _ in range(2):
+                result = match_filing_rules_cascade(
+                    "scan_002.pdf",
+                    rules,
+                    attachment_data=b"same pdf data",
+                    job_number='2506'
+                )
+                assert 'Technical' in [m['rule']['folder_type'] for m in result]
+
+            assert mock_meta.call_count == 1
+
 
 # ============================================================================
 # First 40 Characters Fallback Tests
@@ -201,6 +223,15 @@ class TestFirstContentFallback:
                 folder_types = [m['rule']['folder_type'] for m in result]
                 assert 'Ecology' in folder_types
 
+    def test_junk_lines_skipped(self):
+        """Test page numbers, bare numbers and dates are treated as junk."""
+        for line in ["Page 3 of 12", "12/05/2024", "2024-05-12", "01234 567890",
+                     "March 5, 2024", "5 march 2024", "abc"]:
+            assert is_junk_pdf_line(line), line
+
+        for line in ["Preliminary Ecological Appraisal", "Page Layout Notes", "May Street Survey"]:
+            assert not is_junk_pdf_line(line), line
+
 
 # ============================================================================
 # Per-Attachment Matching Tests
@@ -267,6 +298,130 @@ class TestMultipleKeywords:
         assert matches is not None
 
 
+# ============================================================================
+# Fuzzy Matching Tests
+# ============================================================================
+
+class TestFuzzyMatching:
+    """Tests for typo-tolerant keyword matching."""
+
+    def test_typo_matches_long_keyword(self, project_root, filing_rules_csv):
+        """Test a misspelt keyword of 5+ chars still matches."""
+        rules = load_filing_rules(project_root)
+
+        matches = match_filing_rules("Ecologicle Appraisal.pdf", rules)
+
+        assert matches
+        assert matches[0]['rule']['folder_type'] == 'Ecology'
+        assert 0.85 <= matches[0]['confidence'] < 1.0
+
+    def test_dissimilar_word_does_not_match(self, project_root, filing_rules_csv):
+        """Test words below the similarity threshold are rejected."""
+        rules = load_filing_rules(project_root)
+
+        matches = match_filing_rules("Ecosystem Notes.pdf", rules)
+
+        assert matches == []
+
+    def test_numba_backend_matches_python(self):
+        """Test the compiled fuzzy kernel scores exactly like the Python fallback."""
+        from fileuzi.services import filing_rules
+
+        if not filing_rules.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        words = ['ecologicle', 'écologie', 'appraisal', 'ecol-ogical']
+        for keyword in ['ecological', 'écologique', 'arboricultural impact']:
+            assert (filing_rules._best_fuzzy_ratio_numba(keyword, words)
+                    == filing_rules._best_fuzzy_ratio_py(keyword, words))
+
+    def test_numba_not_imported_with_filing_rules(self):
+        """Test numba/numpy are left unimported until the numba kernel is used."""
+        code = ("import sys, fileuzi.services.filing_rules; "
+                "print('numba' in sys.modules or 'numpy' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == 'False'
+
+    def test_top_only_returns_best_match(self, project_root, filing_rules_csv):
+        """Test top_only returns just the highest-ranked match."""
+        rules = load_filing_rules(project_root)
+
+        filename = "Survey Drawing.pdf"
+        matches = match_filing_rules(filename, rules)
+        top = match_filing_rules(filename, rules, top_only=True)
+
+        assert top == matches[:1]
+
+
+# ============================================================================
+# Match Cache Tests
+# ============================================================================
+
+class TestMatchCache:
+    """Tests for the per-rules match result cache."""
+
+    def test_repeat_filename_served_from_cache(self, project_root, filing_rules_csv):
+        """Test repeated filenames return equal results from the cache."""
+        rules = load_filing_rules(project_root)
+
+        first = match_filing_rules("Structural Calcs.pdf", rules)
+        second = match_filing_rules("Structural Calcs.pdf", rules)
+
+        assert ("Structural Calcs.pdf", 0.85, False) in rules.match_cache
+        assert first == second
+
+    def test_caller_changes_do_not_leak_into_cache(self, project_root, filing_rules_csv):
+        """Test mutating returned matches does not alter cached results."""
+        rules = load_filing_rules(project_root)
+
+        first = match_filing_rules("Structural Calcs.pdf", rules)
+        first[0]['confidence'] = 0.0
+        first.clear()
+
+        second = match_filing_rules("Structural Calcs.pdf", rules)
+        assert second and second[0]['confidence'] > 0
+
+    def test_reload_starts_with_empty_cache(self, project_root, filing_rules_csv):
+        """Test reloading rules discards previously cached results."""
+        rules = load_filing_rules(project_root)
+        match_filing_rules("Structural Calcs.pdf", rules)
+
+        reloaded = load_filing_rules(project_root)
+        assert len(reloaded.match_cache) == 0
+
+
+# ============================================================================
+# Generated Matcher Tests
+# ============================================================================
+
+class TestRulesMatcher:
+    """Tests for the matcher generated per loaded rule set."""
+
+    def test_loaded_rules_carry_matcher(self, project_root, filing_rules_csv):
+        """Test load_filing_rules attaches a generated matcher."""
+        rules = load_filing_rules(project_root)
+
+        assert rules.matcher is not None
+
+    def test_matcher_agrees_with_generic_loop(self, project_root, filing_rules_csv):
+        """Test the generated matcher scores exactly like the generic rule loop."""
+        rules = load_filing_rules(project_root)
+        filenames = [
+            "Structural Calcs.pdf",
+            "Ecologicle Appraisal.pdf",
+            "Topographical Survey - 14 High Street.pdf",
+            "Survey Drawing.pdf",
+            "random_file_xyz.pdf",
+        ]
+
+        generated = [match_filing_rules(name, rules) for name in filenames]
+        generic = [match_filing_rules(name, list(rules)) for name in filenames]
+
+        assert generated == generic
+
+
 # ============================================================================
 # Edge Cases
 # ============================================================================
@@ -15,6 +15,7 @@ from fileuzi.services.job_detector import (
 from fileuzi.services.filing_rules import (
     load_project_mapping,
     apply_project_mapping,
+    ProjectMapping,
 )
 from fileuzi.services.pdf_generator import clean_subject_for_filename
 
@@ -89,6 +90,14 @@ class TestJobNumberFromSubject:
 
         assert detected == '2506'
 
+    def test_leftmost_client_reference_used_when_multiple(self, project_root):
+        """Test the client reference earliest in the subject wins over mapping order."""
+        known_projects = ['2506', '2407']
+        mapping = {'JB/2024/0847': '2506', 'ABC-1': '2407'}
+
+        assert detect_project_from_subject("RE: abc-1 JB/2024/0847", known_projects, mapping) == '2407'
+        assert detect_project_from_subject("RE: JB/2024/0847 abc-1", known_projects, mapping) == '2506'
+
 
 # ============================================================================
 # Client Reference Mapping Tests
@@ -118,6 +127,62 @@ class TestClientReferenceMapping:
         assert len(mapping) > 0
         assert 'JB/2024/0847' in mapping or any('JB/2024/0847' in str(k) for k in mapping.keys())
 
+    def test_mapping_case_insensitive_plain_dict(self):
+        """Test plain dict mappings match regardless of case."""
+        mapping = {'b-013': '2507'}
+
+        assert apply_project_mapping("RE: B-013 Site visit", mapping) == '2507'
+        assert apply_project_mapping("RE: 2507 Site visit", mapping) is None
+
+    def test_mapping_prefers_longest_reference(self):
+        """Test overlapping references resolve to the most specific one."""
+        mapping = ProjectMapping({'B-01': '2400', 'B-012': '2505'})
+
+        assert apply_project_mapping("B-012_01_DRAWING.pdf", mapping) == '2505'
+
+    def test_mapping_recompiles_after_update(self):
+        """Test the compiled lookup follows changes to the mapping."""
+        mapping = ProjectMapping({'B-012': '2505'})
+        assert apply_project_mapping("B-013 Plans", mapping) is None
+
+        mapping['B-013'] = '2507'
+        assert apply_project_mapping("B-013 Plans", mapping) == '2507'
+
+    def test_mapping_prefers_leftmost_reference(self):
+        """Test the reference earliest in the text wins, not the first mapped."""
+        mapping = ProjectMapping({'JB/2024/0847': '2506', 'ABC-1': '2407'})
+
+        assert apply_project_mapping("abc-1 JB/2024/0847", mapping) == '2407'
+        assert apply_project_mapping("JB/2024/0847 abc-1", mapping) == '2506'
+
+    def test_mapping_prefix_prefers_longest_reference(self):
+        """Test a filename prefix resolves to the longest matching reference."""
+        mapping = ProjectMapping({'B-01': '2400', 'B-01-A': '2505'})
+
+        assert mapping.find_prefix("B-01-A_DRAWING.pdf") == '2505'
+        assert mapping.find_prefix("B-01-B_DRAWING.pdf") == '2400'
+
+    def test_mapping_recompiles_after_any_change(self):
+        """Test every dict mutator refreshes the compiled lookup."""
+        mapping = ProjectMapping({'ABC': '2501', 'DEF': '2502'})
+        assert mapping.find("ABC") == '2501'
+
+        mapping.pop('ABC')
+        assert mapping.find("ABC") is None
+
+        mapping.setdefault('GHI', '2503')
+        assert mapping.find("ghi") == '2503'
+
+        mapping |= {'JKL': '2504'}
+        assert mapping.find("jkl") == '2504'
+
+        mapping.popitem()
+        assert mapping.find("jkl") is None
+
+        mapping.clear()
+        assert mapping.find("DEF") is None
+        assert mapping.find_prefix("DEF_01.pdf") is None
+
 
 # ============================================================================
 # Subject Cleaning Tests
@@ -205,6 +270,15 @@ class TestJobNumberFromFilename:
 
         assert job_number is None
 
+    def test_extract_from_mapped_prefix(self):
+        """Test custom project number prefixes map to local job numbers."""
+        mapping = {'B-012': '2505', 'B-01': '2400'}
+
+        assert extract_job_number_from_filename("b-012_01_DRAWING.pdf", mapping) == '2505'
+        assert extract_job_number_from_filename("B-01 - SITE PLAN.pdf", mapping) == '2400'
+        # Reference must be followed by a separator
+        assert extract_job_number_from_filename("B-0123_DRAWING.pdf", mapping) is None
+
 
 # ============================================================================
 # Job Number From Path Tests
@@ -247,6 +321,23 @@ class TestProjectFolderScanning:
         assert '2506' in job_numbers
         assert '2407' in job_numbers
 
+    def test_scan_picks_up_new_project_folder(self, project_root):
+        """Test the cached scan is refreshed when a project folder is added."""
+        before = scan_projects_folder(project_root)
+        assert '2601' not in [p[0] for p in before]
+
+        (project_root / "2601_NEW-HOUSE").mkdir()
+
+        after = scan_projects_folder(project_root)
+        assert '2601' in [p[0] for p in after]
+
+    def test_scan_result_not_shared(self, project_root):
+        """Test callers get their own list, not the cached one."""
+        projects = scan_projects_folder(project_root)
+        projects.clear()
+
+        assert len(scan_projects_folder(project_root)) >= 2
+
     def test_parse_folder_name_standard(self):
         """Test parsing standard folder name format."""
         folder_name = "2506_SMITH-EXTENSION"
@@ -435,6 +435,29 @@ class TestDialogChanges:
         assert hasattr(DifferentLocationDuplicateDialog, 'on_file_new_location')
         assert hasattr(DifferentLocationDuplicateDialog, 'on_replace_existing')
 
+    def test_dialog_styles_re_registered_after_sheet_replaced(self):
+        """Test dialog rules are added once, and again if the app sheet is replaced."""
+        pytest.importorskip('PyQt6')
+        from fileuzi.ui.dialogs import register_dialog_styles, _DIALOG_STYLE
+
+        class FakeApp:
+            sheet = "QWidget {}"
+
+            def styleSheet(self):
+                return self.sheet
+
+            def setStyleSheet(self, sheet):
+                self.sheet = sheet
+
+        app = FakeApp()
+        register_dialog_styles(app)
+        register_dialog_styles(app)
+        assert app.sheet == "QWidget {}" + _DIALOG_STYLE
+
+        app.setStyleSheet("QLabel {}")
+        register_dialog_styles(app)
+        assert app.sheet == "QLabel {}" + _DIALOG_STYLE
+
 
 # ============================================================================
 # Unit Tests: Drawing Superseding Integration
@@ -13,6 +13,9 @@ from fileuzi.services.pdf_generator import (
     generate_screenshot_filenames,
     convert_image_to_png,
     clean_subject_for_filename,
+    generate_email_pdf,
+    process_outbound_email_capture,
+    check_unique_pdf_filename,
 )
 
 
@@ -135,6 +138,36 @@ class TestPdfEmailNaming:
         for char in invalid_chars:
             assert char not in cleaned
 
+    def test_unique_pdf_filename_skips_taken_suffixes(self, tmp_path):
+        """Test clashing PDF names get the next free letter suffix."""
+        filename = "2506_email_2025-01-15_Query.pdf"
+        assert check_unique_pdf_filename(tmp_path, filename) == filename
+
+        for name in [filename, "2506_email_2025-01-15_Query_b.pdf", "2506_EMAIL_2025-01-15_QUERY_c.PDF"]:
+            (tmp_path / name).write_bytes(b'%PDF')
+
+        assert check_unique_pdf_filename(tmp_path, filename) == "2506_email_2025-01-15_Query_d.pdf"
+
+    def test_unique_pdf_filename_respects_taken_names(self, tmp_path):
+        """Test names claimed but not yet written count as taken."""
+        filename = "2506_email_2025-01-15_Query.pdf"
+
+        assert check_unique_pdf_filename(tmp_path, filename, taken=[filename]) == \
+            "2506_email_2025-01-15_Query_b.pdf"
+        assert check_unique_pdf_filename(
+            tmp_path, filename, taken=[filename, "2506_email_2025-01-15_Query_b.pdf"]
+        ) == "2506_email_2025-01-15_Query_c.pdf"
+
+    def test_unique_pdf_filename_checks_disk_when_listing_fails(self, tmp_path):
+        """Test an unlistable folder still falls back to per-name existence checks."""
+        filename = "2506_email_2025-01-15_Query.pdf"
+        for name in [filename, "2506_email_2025-01-15_Query_b.pdf"]:
+            (tmp_path / name).write_bytes(b'%PDF')
+
+        with patch('fileuzi.services.pdf_generator.os.scandir', side_effect=PermissionError):
+            assert check_unique_pdf_filename(tmp_path, filename) == \
+                "2506_email_2025-01-15_Query_c.pdf"
+
 
 # ============================================================================
 # Image Conversion Tests
@@ -163,18 +196,157 @@ class TestImageConversion:
             # When PIL is available and mocked, the function should call Image.open
             mock_image.open.assert_called_once()
 
+    def test_jpeg_decoded_at_full_resolution(self):
+        """Test JPEGs are not draft-decoded; the PNG is the filed screenshot."""
+        jpeg_data = b'\xff\xd8\xff' + b'\x00' * 100
+
+        mock_image = MagicMock()
+        mock_img = mock_image.open.return_value.__enter__.return_value
+        mock_img.format = 'JPEG'
+        mock_img.mode = 'RGB'
+
+        pdf_module = __import__('fileuzi.services.pdf_generator', fromlist=['pdf_generator'])
+        with patch.object(pdf_module, 'Image', mock_image, create=True), \
+                patch.object(pdf_module, 'HAS_PIL', True):
+            convert_image_to_png(jpeg_data)
+
+        mock_img.draft.assert_not_called()
+
     def test_png_image_not_converted(self):
         """Test PNG images are not unnecessarily converted."""
         # Valid PNG header
         png_data = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
 
-        # The function should handle PNG data
-        # (may or may not convert, but should not crash)
-        try:
+        mock_image = MagicMock()
+
+        with patch.object(
+            __import__('fileuzi.services.pdf_generator', fromlist=['pdf_generator']),
+            'Image', mock_image, create=True
+        ), patch('fileuzi.services.pdf_generator.HAS_PIL', True):
             result = convert_image_to_png(png_data)
-        except Exception:
-            # May fail without complete valid image
-            pass
+
+        # PNG bytes are returned as-is, without a decode/re-encode
+        assert result is png_data
+        mock_image.open.assert_not_called()
+
+
+# ============================================================================
+# Email PDF Rendering Tests
+# ============================================================================
+
+def _render_email_html(email_data, embedded_images, projects_root):
+    """Run generate_email_pdf with a mocked renderer and return the HTML it was given."""
+    mock_render = MagicMock(return_value=b'%PDF-1.4 fake')
+    pdf_module = __import__('fileuzi.services.pdf_generator', fromlist=['pdf_generator'])
+
+    with patch.object(pdf_module, '_render_pdf', mock_render), \
+            patch.object(pdf_module, 'HAS_PDF_RENDERER', True):
+        pdf_data, filename = generate_email_pdf(email_data, embedded_images, '2506', projects_root)
+
+    assert pdf_data == b'%PDF-1.4 fake'
+    return mock_render.call_args.args[0].decode('utf-8')
+
+
+class TestEmailPdfRendering:
+    """Tests for the HTML handed to the PDF renderer."""
+
+    def test_inline_images_replaced_with_data_urls(self, project_root):
+        """Test every cid: reference is swapped for its own image's data URL."""
+        email_data = {
+            'subject': 'Site photos',
+            'date': datetime(2025, 1, 15, 10, 30),
+            'html_body': '<html><body><img src="cid:img1"><img src="CID:img10"></body></html>',
+        }
+        embedded_images = [
+            {'content_id': 'img1', 'data': b'one', 'content_type': 'image/png'},
+            {'content_id': 'img10', 'data': b'ten', 'content_type': 'image/jpeg'},
+        ]
+
+        html = _render_email_html(email_data, embedded_images, project_root)
+
+        assert 'src="data:image/png;base64,b25l"' in html
+        assert 'src="data:image/jpeg;base64,dGVu"' in html
+        assert 'cid:' not in html.lower()
+
+    def test_only_email_body_contents_embedded(self, project_root):
+        """Test the email's own <head> and <body> wrapper are stripped."""
+        email_data = {
+            'subject': 'Minutes',
+            'date': datetime(2025, 1, 15, 10, 30),
+            'html_body': ('<HTML><head><title>Outlook</title></head>'
+                          '<BODY class="x"><p>Agreed &gt; 2 m</p></BODY></HTML>'),
+        }
+
+        html = _render_email_html(email_data, [], project_root)
+
+        assert '<div class="email-body"><p>Agreed &gt; 2 m</p></div>' in html
+        assert 'Outlook' not in html
+
+
+# ============================================================================
+# Outbound Capture Tests
+# ============================================================================
+
+class TestOutboundCapture:
+    """Tests for writing captured screenshots and email PDFs."""
+
+    def test_capture_written_to_every_destination(self, project_root):
+        """Test screenshots and the PDF land in primary and secondary folders."""
+        project = project_root / "2506_SMITH-EXTENSION"
+        dest = project / "ADMIN"
+        secondary = [project / "TECHNICAL", project / "IMPORTS-EXPORTS"]
+        images = [{'content_id': 'a', 'data': b'\x89PNG\r\n\x1a\n' + b'\x00' * 10,
+                   'content_type': 'image/png'}]
+        email_data = {'from': 'me@example.com', 'date': datetime(2025, 1, 15), 'subject': 'Photos'}
+
+        with patch('fileuzi.services.pdf_generator.extract_embedded_images', return_value=images), \
+                patch('fileuzi.services.email_parser.MY_EMAIL_ADDRESSES', ['me@example.com']), \
+                patch('fileuzi.services.pdf_generator.generate_email_pdf',
+                      return_value=(b'%PDF', '2506_email_2025-01-15_Photos.pdf')):
+            result = process_outbound_email_capture(
+                MagicMock(), email_data, '2506', dest, project_root, secondary_paths=secondary
+            )
+
+        assert result['success'] is True
+        assert result['screenshots'] == ['2506_email_screenshot_2025-01-15_001.png']
+        assert result['pdf_filename'] == '2506_email_2025-01-15_Photos.pdf'
+        for folder in [dest] + secondary:
+            assert (folder / '2506_email_screenshot_2025-01-15_001.png').exists()
+            assert (folder / '2506_email_2025-01-15_Photos.pdf').read_bytes() == b'%PDF'
+
+    def test_keystage_same_as_primary_keeps_both_pdfs(self, project_root):
+        """Test a folder listed twice gets a suffixed second PDF, not a clash."""
+        dest = project_root / "2506_SMITH-EXTENSION" / "ADMIN"
+        images = [{'content_id': 'a', 'data': b'\x89PNG\r\n\x1a\n' + b'\x00' * 10,
+                   'content_type': 'image/png'}]
+        email_data = {'from': 'me@example.com', 'date': datetime(2025, 1, 15), 'subject': 'Photos'}
+
+        with patch('fileuzi.services.pdf_generator.extract_embedded_images', return_value=images), \
+                patch('fileuzi.services.email_parser.MY_EMAIL_ADDRESSES', ['me@example.com']), \
+                patch('fileuzi.services.pdf_generator.generate_email_pdf',
+                      return_value=(b'%PDF', '2506_email_2025-01-15_Photos.pdf')):
+            result = process_outbound_email_capture(
+                MagicMock(), email_data, '2506', dest, project_root, keystage_folder=dest
+            )
+
+        assert result['success'] is True
+        assert result['screenshots'] == ['2506_email_screenshot_2025-01-15_001.png']
+        assert (dest / '2506_email_2025-01-15_Photos.pdf').read_bytes() == b'%PDF'
+        assert (dest / '2506_email_2025-01-15_Photos_b.pdf').read_bytes() == b'%PDF'
+        assert result['pdf_filename'] == '2506_email_2025-01-15_Photos_b.pdf'
+
+    def test_inbound_email_skips_image_extraction(self, project_root):
+        """Test emails not sent by us are rejected before walking the MIME tree."""
+        email_data = {'from': 'client@example.org', 'date': datetime(2025, 1, 15), 'subject': 'Photos'}
+
+        with patch('fileuzi.services.pdf_generator.extract_embedded_images') as mock_extract, \
+                patch('fileuzi.services.email_parser.MY_EMAIL_ADDRESSES', ['me@example.com']):
+            result = process_outbound_email_capture(
+                MagicMock(), email_data, '2506', project_root / "2506_SMITH-EXTENSION", project_root
+            )
+
+        mock_extract.assert_not_called()
+        assert result == {'screenshots': [], 'pdf_filename': None, 'success': True}
 
 
 # ============================================================================